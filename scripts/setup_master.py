@@ -202,6 +202,9 @@ def setup_database_schema():
         -- Enable UUID extension for better session IDs
         CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
+        -- Trigram matching for substring conversation search
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
         -- Conversation sessions table
         CREATE TABLE IF NOT EXISTS conversation_sessions (
             session_id VARCHAR(255) PRIMARY KEY,
@@ -227,8 +230,33 @@ def setup_database_schema():
             UNIQUE(session_id, sequence_number)
         );
 
-        -- Indexes for optimal performance
-        CREATE INDEX IF NOT EXISTS idx_conversation_messages_session_id ON conversation_messages(session_id);
+        -- Allocate per-session sequence numbers in the database so inserts
+        -- need a single round trip. The session row lock serialises writers.
+        CREATE OR REPLACE FUNCTION assign_message_sequence() RETURNS TRIGGER AS $$
+        BEGIN
+            IF NEW.sequence_number IS NULL THEN
+                PERFORM 1 FROM conversation_sessions
+                WHERE session_id = NEW.session_id
+                FOR UPDATE;
+
+                SELECT COALESCE(MAX(sequence_number), 0) + 1
+                INTO NEW.sequence_number
+                FROM conversation_messages
+                WHERE session_id = NEW.session_id;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        DROP TRIGGER IF EXISTS trg_assign_message_sequence ON conversation_messages;
+        CREATE TRIGGER trg_assign_message_sequence
+            BEFORE INSERT ON conversation_messages
+            FOR EACH ROW EXECUTE FUNCTION assign_message_sequence();
+
+        -- Indexes for optimal performance. The (session_id, sequence_number)
+        -- index returns history rows already ordered, so reads need no sort,
+        -- and it also covers session_id-only lookups.
+        DROP INDEX IF EXISTS idx_conversation_messages_session_id;
         CREATE INDEX IF NOT EXISTS idx_conversation_messages_sequence ON conversation_messages(session_id, sequence_number);
         CREATE INDEX IF NOT EXISTS idx_conversation_messages_timestamp ON conversation_messages(timestamp);
 
@@ -260,6 +288,18 @@ def setup_database_schema():
         cursor.execute(conversation_schema)
         print("✅ Database schema created successfully")
         
+        # Full-text search index for conversation search. CONCURRENTLY cannot
+        # run inside a transaction block, so it is issued on its own.
+        cursor.execute("""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_conversation_messages_content_fts
+        ON conversation_messages USING gin (to_tsvector('english', content));
+        """)
+        cursor.execute("""
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_conversation_messages_content_trgm
+        ON conversation_messages USING gin (content gin_trgm_ops);
+        """)
+        print("✅ Conversation search indexes created")
+        
         cursor.close()
         conn.close()
         return True
@@ -0,0 +1,78 @@
+"""
+Tests for the base_fetch_url cache and in-flight request sharing.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# RivalSearchMCP modules import each other from its own src directory
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "RivalSearchMCP" / "src"))
+
+base_fetch = pytest.importorskip("core.fetch.base_fetch")
+
+URL = "https://example.com/"
+
+
+@pytest.fixture
+def network(monkeypatch):
+    """Replace the network fetch with one that waits until released."""
+    state = {'calls': 0, 'release': asyncio.Event(), 'content': "<html>page</html>"}
+
+    async def fetch(url, use_cloudscraper):
+        state['calls'] += 1
+        await state['release'].wait()
+        return state['content']
+
+    monkeypatch.setattr(base_fetch, "_fetch_uncached", fetch)
+    base_fetch.clear_fetch_cache()
+    yield state
+    base_fetch.clear_fetch_cache()
+    assert not base_fetch._inflight_fetches
+
+
+async def test_concurrent_fetches_share_one_request(network):
+    fetches = [asyncio.create_task(base_fetch.base_fetch_url(URL)) for _ in range(5)]
+    await asyncio.sleep(0)
+    network['release'].set()
+
+    assert await asyncio.gather(*fetches) == [network['content']] * 5
+    assert network['calls'] == 1
+
+
+async def test_successful_fetch_is_served_from_cache(network):
+    network['release'].set()
+
+    await base_fetch.base_fetch_url(URL)
+    assert await base_fetch.base_fetch_url(URL) == network['content']
+    assert network['calls'] == 1
+
+    # The cloudscraper variant is cached separately
+    await base_fetch.base_fetch_url(URL, use_cloudscraper=True)
+    assert network['calls'] == 2
+
+
+async def test_failed_fetch_is_not_cached(network):
+    network['content'] = None
+    network['release'].set()
+
+    assert await base_fetch.base_fetch_url(URL) is None
+    assert await base_fetch.base_fetch_url(URL) is None
+    assert network['calls'] == 2
+
+
+async def test_waiter_survives_cancelled_leader(network):
+    leader = asyncio.create_task(base_fetch.base_fetch_url(URL))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(base_fetch.base_fetch_url(URL))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+    network['release'].set()
+    assert await follower == network['content']
+    assert network['calls'] == 1
@@ -0,0 +1,66 @@
+"""
+Tests for breadth-first expansion in WebsiteTraverser.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# RivalSearchMCP modules import each other from its own src directory
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "RivalSearchMCP" / "src"))
+
+core_traverser = pytest.importorskip("core.traverse.core_traverser")
+
+START = "https://example.com/"
+
+
+def make_traverser(links, failing=()):
+    """A traverser over an in-memory site; the parsed tree is just the page URL."""
+    traverser = core_traverser.WebsiteTraverser()
+    fetched = []
+
+    async def fetch(url, delay):
+        fetched.append(url)
+        if url in failing:
+            return None
+        return {'url': url}, url
+
+    traverser._fetch_guarded = fetch
+    traverser._extract_links = lambda tree, base_url: links.get(tree, [])
+    return traverser, fetched
+
+
+async def test_failed_fetches_are_replaced_from_remaining_links():
+    links = {START: [f"{START}{i}" for i in range(6)]}
+    traverser, fetched = make_traverser(links, failing={f"{START}0", f"{START}1"})
+
+    pages = await traverser.traverse_website(START, max_pages=4, delay=0)
+
+    assert [page['url'] for page in pages] == [START, f"{START}2", f"{START}3", f"{START}4"]
+    assert fetched == [START] + [f"{START}{i}" for i in range(5)]
+
+
+async def test_pages_of_a_level_share_the_budget():
+    links = {
+        START: [f"{START}a", f"{START}b"],
+        f"{START}a": [f"{START}a/{i}" for i in range(5)],
+        f"{START}b": [f"{START}b/{i}" for i in range(5)],
+    }
+    traverser, fetched = make_traverser(links)
+
+    pages = await traverser.traverse_website(START, max_pages=5, delay=0)
+
+    assert [page['url'] for page in pages] == [
+        START, f"{START}a", f"{START}b", f"{START}a/0", f"{START}b/0"
+    ]
+    assert fetched == [page['url'] for page in pages]
+
+
+async def test_traversal_stops_at_max_depth():
+    links = {START: [f"{START}a"], f"{START}a": [f"{START}a/b"], f"{START}a/b": [f"{START}a/b/c"]}
+    traverser, _ = make_traverser(links)
+
+    pages = await traverser.traverse_website(START, max_depth=1, delay=0)
+
+    assert [page['url'] for page in pages] == [START, f"{START}a"]
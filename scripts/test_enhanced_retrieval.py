@@ -0,0 +1,77 @@
+"""
+Tests for list-mode dispatch in rival_retrieve.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# RivalSearchMCP modules import each other from its own src directory
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "RivalSearchMCP" / "src"))
+
+enhanced_retrieval = pytest.importorskip("core.fetch.enhanced_retrieval")
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Replace the URL and search paths with recorders that track concurrency."""
+    calls = {'url': [], 'search': [], 'active': 0, 'peak': 0}
+
+    async def track(kind, value):
+        calls[kind].append(value)
+        calls['active'] += 1
+        calls['peak'] = max(calls['peak'], calls['active'])
+        await asyncio.sleep(0.01)
+        calls['active'] -= 1
+
+    async def fake_url(url, max_length):
+        await track('url', url)
+        return f"page {url}"
+
+    async def fake_search(query, limit, max_length):
+        await track('search', query)
+        return f"results {query}"
+
+    monkeypatch.setattr(enhanced_retrieval, "_retrieve_url", fake_url)
+    monkeypatch.setattr(enhanced_retrieval, "_retrieve_search", fake_search)
+    return calls
+
+
+async def test_list_retrieves_every_item(calls):
+    urls = [f"https://example.com/{i}" for i in range(8)]
+
+    results = await enhanced_retrieval.rival_retrieve(urls, limit=5, max_workers=3)
+
+    assert [result['resource'] for result in results] == urls
+    assert all(result['success'] for result in results)
+    assert sorted(calls['url']) == sorted(urls)
+    assert calls['peak'] == 3
+
+
+async def test_mixed_list_dispatches_each_item(calls):
+    resources = ["search:python asyncio", "https://example.com/a", "rust tokio", "http://example.org/b"]
+
+    results = await enhanced_retrieval.rival_retrieve(resources)
+
+    assert calls['url'] == ["https://example.com/a", "http://example.org/b"]
+    assert calls['search'] == ["python asyncio", "rust tokio"]
+    assert [result['content'] for result in results] == [
+        "results python asyncio",
+        "page https://example.com/a",
+        "results rust tokio",
+        "page http://example.org/b",
+    ]
+
+
+async def test_failed_item_does_not_fail_the_batch(calls, monkeypatch):
+    async def failing_search(query, limit, max_length):
+        raise RuntimeError("blocked")
+
+    monkeypatch.setattr(enhanced_retrieval, "_retrieve_search", failing_search)
+
+    results = await enhanced_retrieval.rival_retrieve(["search:x", "https://example.com/"])
+
+    assert results[0] == {'resource': "search:x", 'content': None, 'success': False, 'error': "blocked"}
+    assert results[1]['success']
@@ -0,0 +1,282 @@
+"""
+Tests for CompleteMemoryService against a recording connection.
+"""
+
+import importlib.util
+from contextlib import asynccontextmanager, nullcontext
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("asyncpg")
+pytest.importorskip("pydantic_ai")
+
+# Loaded by path: the src package __init__ imports the whole agent stack
+_spec = importlib.util.spec_from_file_location(
+    "memory_service",
+    Path(__file__).parent.parent / "src" / "core" / "services" / "memory_service.py",
+)
+memory_service = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(memory_service)
+
+from pydantic_ai.messages import ModelRequest, ModelResponse, SystemPromptPart  # noqa: E402
+
+
+class RecordingConnection:
+    """Connection stub that records statements and returns canned results."""
+
+    def __init__(self, fetchrow=None, fetch=(), fetchval=None):
+        self.fetchrow_result = fetchrow
+        self.fetch_result = list(fetch)
+        self.fetchval_result = fetchval
+        self.calls = []
+        self.in_transaction = False
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.in_transaction = True
+        try:
+            yield
+        finally:
+            self.in_transaction = False
+
+    async def cursor(self, query, *args, prefetch):
+        # asyncpg only allows cursors inside a transaction
+        assert self.in_transaction
+        self.calls.append(('cursor', query, args + (prefetch,)))
+        for row in self.fetch_result:
+            yield row
+
+    async def set_type_codec(self, typename, **kwargs):
+        self.calls.append(('set_type_codec', typename, kwargs))
+
+    async def fetchrow(self, query, *args):
+        self.calls.append(('fetchrow', query, args))
+        return self.fetchrow_result
+
+    async def fetch(self, query, *args):
+        self.calls.append(('fetch', query, args))
+        return self.fetch_result
+
+    async def fetchval(self, query, *args):
+        self.calls.append(('fetchval', query, args))
+        return self.fetchval_result
+
+    async def execute(self, query, *args):
+        self.calls.append(('execute', query, args))
+
+    async def executemany(self, query, records):
+        assert self.in_transaction
+        self.calls.append(('executemany', query, (records,)))
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.calls.append(('copy_records_to_table', table, (records, columns)))
+
+    def called(self, method):
+        return [call for call in self.calls if call[0] == method]
+
+
+class RecordingPool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        return nullcontext(self.conn)
+
+
+def make_service(conn):
+    service = memory_service.CompleteMemoryService("postgresql://unused")
+    service._pool = RecordingPool(conn)
+    return service
+
+
+async def test_refresh_summary_skips_below_threshold():
+    conn = RecordingConnection(fetchrow={'summary': None, 'summary_through': 0, 'last_sequence': 15})
+
+    assert await make_service(conn).refresh_summary("s1", window=10) is None
+    assert not conn.called('fetch')
+    assert not conn.called('execute')
+
+
+async def test_refresh_summary_records_summary_through():
+    rows = [{'role': 'user', 'content': f"question {i}"} for i in range(1, 21)]
+    conn = RecordingConnection(
+        fetchrow={'summary': "user: earlier", 'summary_through': 4, 'last_sequence': 30},
+        fetch=rows,
+    )
+
+    summary = await make_service(conn).refresh_summary("s1", window=10)
+
+    assert conn.called('fetch')[0][2] == ("s1", 4, 20)
+    assert summary.split('\n')[:2] == ["user: earlier", "user: question 1"]
+    (_, _, (session_id, metadata)), = conn.called('execute')
+    assert session_id == "s1"
+    assert metadata == {'summary': summary, 'summary_through': 20}
+
+
+async def test_refresh_summary_drops_whole_lines():
+    previous = '\n'.join(f"assistant: {'x' * 150} {i}" for i in range(40))
+    rows = [{'role': 'user', 'content': 'y' * 500} for _ in range(10)]
+    conn = RecordingConnection(
+        fetchrow={'summary': previous, 'summary_through': 0, 'last_sequence': 20},
+        fetch=rows,
+    )
+
+    summary = await make_service(conn).refresh_summary("s1", window=10)
+
+    assert len(summary) <= memory_service.SUMMARY_MAX_CHARS
+    lines = summary.split('\n')
+    assert all(line.startswith(('assistant: ', 'user: ')) for line in lines)
+    assert lines[-1] == f"user: {'y' * memory_service.SUMMARY_LINE_CHARS}..."
+
+
+async def test_windowed_messages_start_with_summary():
+    conn = RecordingConnection(
+        fetch=[{'role': 'assistant', 'content': "answer"}, {'role': 'user', 'content': "question"}],
+        fetchval="user: earlier",
+    )
+
+    messages = await make_service(conn).get_conversation_as_pydantic_messages("s1", window=2)
+
+    assert conn.called('fetch')[0][2] == ("s1", 2)
+    assert isinstance(messages[0], ModelRequest)
+    assert isinstance(messages[0].parts[0], SystemPromptPart)
+    assert messages[0].parts[0].content == "Summary of the earlier conversation:\nuser: earlier"
+    assert messages[1].parts[0].content == "question"
+    assert isinstance(messages[2], ModelResponse)
+    assert messages[2].parts[0].content == "answer"
+
+
+async def test_windowed_messages_without_summary():
+    conn = RecordingConnection(fetch=[{'role': 'user', 'content': "question"}], fetchval="user: earlier")
+
+    messages = await make_service(conn).get_conversation_as_pydantic_messages(
+        "s1", window=2, include_summary=False
+    )
+
+    assert [message.parts[0].content for message in messages] == ["question"]
+    assert not conn.called('fetchval')
+
+
+async def test_add_message_goes_through_add_messages():
+    conn = RecordingConnection(fetchval=7)
+
+    assert await make_service(conn).add_message("s1", 'user', "hello", token_count=3) == 8
+    (_, _, (records,)), = conn.called('executemany')
+    assert records == [("s1", 'user', "hello", {}, 8, 3)]
+    assert not conn.called('copy_records_to_table')
+
+
+@pytest.mark.parametrize("count, method", [
+    (memory_service.COPY_THRESHOLD - 1, 'executemany'),
+    (memory_service.COPY_THRESHOLD, 'copy_records_to_table'),
+])
+async def test_add_messages_switches_to_copy_at_threshold(count, method):
+    conn = RecordingConnection(fetchval=2)
+    messages = [('user', f"message {i}", None, 0) for i in range(count)]
+
+    sequence_numbers = await make_service(conn).add_messages("s1", messages)
+
+    assert sequence_numbers == list(range(3, count + 3))
+    (_, _, (records, *rest)), = conn.called(method)
+    assert [record[4] for record in records] == sequence_numbers
+    if method == 'copy_records_to_table':
+        assert rest == [['session_id', 'role', 'content', 'metadata', 'sequence_number', 'token_count']]
+        assert not conn.called('executemany')
+    else:
+        assert not conn.called('copy_records_to_table')
+
+
+@pytest.mark.parametrize("value", [{}, {'summary': "ü ✓", 'summary_through': 20}, [1, None, "x"]])
+def test_jsonb_codec_round_trip(value):
+    data = memory_service._encode_jsonb(value)
+
+    assert data[:1] == b'\x01'
+    assert memory_service._decode_jsonb(data) == value
+
+
+async def test_connections_register_binary_jsonb_codec():
+    conn = RecordingConnection()
+
+    await memory_service.CompleteMemoryService._init_connection(conn)
+
+    (_, typename, kwargs), = conn.called('set_type_codec')
+    assert typename == 'jsonb'
+    assert kwargs['format'] == 'binary'
+    assert kwargs['encoder'] is memory_service._encode_jsonb
+    assert kwargs['decoder'] is memory_service._decode_jsonb
+
+
+async def test_complete_conversation_streams_through_cursor():
+    rows = [
+        {'role': 'user', 'content': "question", 'timestamp': None, 'sequence_number': 1, 'metadata': {}},
+        {'role': 'assistant', 'content': "answer", 'timestamp': None, 'sequence_number': 2, 'metadata': {'a': 1}},
+    ]
+    conn = RecordingConnection(fetch=rows)
+
+    messages = [message async for message in make_service(conn).iter_complete_conversation("s1", prefetch=50)]
+
+    assert messages == rows
+    assert conn.called('cursor')[0][2] == ("s1", 50)
+    assert not conn.called('fetch')
+
+
+async def test_unwindowed_messages_stream_through_cursor():
+    rows = [{'role': 'user', 'content': "question"}, {'role': 'tool', 'content': "skipped"}]
+    conn = RecordingConnection(fetch=rows)
+
+    messages = await make_service(conn).get_conversation_as_pydantic_messages("s1")
+
+    assert [message.parts[0].content for message in messages] == ["question"]
+    assert conn.called('cursor')
+    assert not conn.called('fetchval')
+
+
+async def test_search_uses_full_text_query():
+    conn = RecordingConnection(fetch=[{
+        'session_id': "s1", 'created_at': None, 'message_count': 2,
+        'matching_content': "asyncio tips", 'sequence_number': 2,
+    }])
+
+    results = await make_service(conn).search_conversations("  asyncio  ", limit=5)
+
+    (_, query, args), = conn.called('fetch')
+    assert "plainto_tsquery" in query and "ILIKE" not in query
+    assert args == ("asyncio", 5)
+    assert results[0]['matching_content'] == "asyncio tips"
+
+
+@pytest.mark.parametrize("query, substring, pattern", [("x", False, "%x%"), ("http://ex", True, "%http://ex%")])
+async def test_search_falls_back_to_substring_match(query, substring, pattern):
+    conn = RecordingConnection()
+
+    await make_service(conn).search_conversations(query, substring=substring)
+
+    (_, sql, args), = conn.called('fetch')
+    assert "ILIKE" in sql
+    assert args == (pattern, 10)
+
+
+async def test_short_substring_search_is_rejected():
+    service = memory_service.CompleteMemoryService("postgresql://unused")
+
+    assert await service.search_conversations("ab", substring=True) == []
+    assert service._pool is None
+
+
+async def test_sequence_numbers_are_allocated_under_the_session_lock():
+    conn = RecordingConnection(fetchval=0)
+
+    await make_service(conn).add_messages("s1", [('user', "a", None, 0), ('assistant', "b", None, 0)])
+
+    lock, last_sequence, insert = conn.calls
+    assert lock[0] == 'execute' and "FOR UPDATE" in lock[1]
+    assert last_sequence[0] == 'fetchval' and "MAX(sequence_number)" in last_sequence[1]
+    assert [record[4] for record in insert[2][0]] == [1, 2]
+
+
+async def test_add_messages_without_messages_skips_the_database():
+    service = memory_service.CompleteMemoryService("postgresql://unused")
+
+    assert await service.add_messages("s1", []) == []
+    assert service._pool is None
@@ -0,0 +1,140 @@
+"""
+Tests for OCR engine selection, image preprocessing and batching.
+"""
+
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+# RivalSearchMCP modules import each other from its own src directory
+sys.path.insert(0, str(Path(__file__).parent.parent / "src" / "RivalSearchMCP" / "src"))
+
+ocr_processing = pytest.importorskip("core.search.ocr_processing")
+
+from PIL import Image  # noqa: E402
+
+
+@pytest.fixture
+def broken_tesserocr(monkeypatch):
+    """A tesserocr engine whose initialization always fails, and a subprocess stand-in."""
+    inits = []
+
+    class FailingAPI:
+        def __init__(self):
+            inits.append(1)
+            raise RuntimeError("Failed to init API, possibly an invalid tessdata path")
+
+    monkeypatch.setattr(ocr_processing, "PyTessBaseAPI", FailingAPI)
+    monkeypatch.setattr(ocr_processing, "_tesserocr_failed", False)
+    monkeypatch.setattr(ocr_processing, "_tess_local", ocr_processing.threading.local())
+    monkeypatch.setattr(ocr_processing, "_ocr_batch", lambda images: ["text"] * len(images))
+    return inits
+
+
+def test_failed_tesserocr_init_is_not_retried(broken_tesserocr, caplog):
+    # The MCP logger does not propagate, so attach the capture handler directly
+    logger = logging.getLogger("rival_search_mcp")
+    logger.addHandler(caplog.handler)
+    try:
+        images = [Image.new('L', (8, 8), 255)]
+        # Each call runs on a fresh thread, which has no engine of its own yet
+        for _ in range(3):
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                assert pool.submit(ocr_processing._ocr_images, images).result() == ["text"]
+    finally:
+        logger.removeHandler(caplog.handler)
+
+    assert len(broken_tesserocr) == 1
+    assert [record.levelno for record in caplog.records] == [logging.WARNING]
+
+
+def _dark_square_on_transparency(mode):
+    """A black square on a fully transparent background, in the given mode."""
+    if mode == 'P':
+        # Palette entries 0 and 1 are both black; entry 0 is transparent
+        img = Image.new('P', (64, 64), 0)
+        img.putpalette([0, 0, 0, 0, 0, 0])
+        img.paste(1, (16, 16, 48, 48))
+        img.info['transparency'] = 0
+        return img
+    img = Image.new('RGBA', (64, 64), (0, 0, 0, 0))
+    img.paste((0, 0, 0, 255), (16, 16, 48, 48))
+    return img.convert(mode)
+
+
+@pytest.mark.parametrize("mode", ['RGBA', 'LA', 'P'])
+def test_transparent_background_becomes_white(mode):
+    img = _dark_square_on_transparency(mode)
+
+    binarized = ocr_processing._preprocess_image(img).convert('L')
+
+    assert binarized.getpixel((2, 2)) == 255
+    assert binarized.getpixel((32, 32)) == 0
+
+
+def test_batch_ocr_runs_once_over_a_list_file(monkeypatch):
+    runs = []
+
+    def fake_image_to_string(list_path):
+        with open(list_path) as f:
+            paths = f.read().split('\n')
+        runs.append([Image.open(path).size for path in paths])
+        return "first\fsecond\f"
+
+    monkeypatch.setattr(ocr_processing, "image_to_string", fake_image_to_string)
+    images = [Image.new('1', (10, 20)), Image.new('P', (30, 40))]
+
+    assert ocr_processing._ocr_batch(images) == ["first", "second"]
+    assert runs == [[(10, 20), (30, 40)]]
+
+
+def test_failed_batch_falls_back_to_single_images(monkeypatch):
+    monkeypatch.setattr(ocr_processing, "PyTessBaseAPI", None)
+
+    def failing_batch(images):
+        raise ocr_processing.TesseractError(1, "bad list file")
+
+    def fake_image_to_string(img):
+        if img.size == (1, 1):
+            raise OSError("unreadable")
+        return f"{img.size[0]}"
+
+    monkeypatch.setattr(ocr_processing, "_ocr_batch", failing_batch)
+    monkeypatch.setattr(ocr_processing, "image_to_string", fake_image_to_string)
+    images = [Image.new('L', (5, 5)), Image.new('L', (1, 1)), Image.new('L', (7, 7))]
+
+    assert ocr_processing._ocr_images(images) == ["5", "7"]
+
+
+async def test_page_images_are_deduplicated_capped_and_batched(monkeypatch):
+    bs4 = pytest.importorskip("bs4")
+    png = BytesIO()
+    Image.new('RGB', (4, 4), 'white').save(png, 'PNG')
+    downloads = []
+    batches = []
+
+    async def fake_download(client, url):
+        downloads.append(url)
+        return png.getvalue()
+
+    def fake_ocr_images(images):
+        batches.append(len(images))
+        return [f"text {i}" for i in range(len(images))]
+
+    monkeypatch.setattr(ocr_processing, "_download_image", fake_download)
+    monkeypatch.setattr(ocr_processing, "_ocr_images", fake_ocr_images)
+    tags = ['<img src="/logo.png">'] * 3 + [f'<img src="img/{i}.png">' for i in range(30)]
+    soup = bs4.BeautifulSoup(''.join(tags), 'html.parser')
+
+    texts = await ocr_processing.process_images_ocr(soup, "https://example.com/page/")
+
+    assert downloads[0] == "https://example.com/logo.png"
+    assert downloads[1] == "https://example.com/page/img/0.png"
+    assert len(downloads) == len(set(downloads)) == ocr_processing.MAX_OCR_IMAGES
+    assert sum(batches) == ocr_processing.MAX_OCR_IMAGES
+    assert len(batches) <= ocr_processing.OCR_WORKERS
+    assert len(texts) == ocr_processing.MAX_OCR_IMAGES
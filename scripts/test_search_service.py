@@ -0,0 +1,64 @@
+"""
+Tests for SearchService request coalescing.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+search_service = pytest.importorskip("src.core.services.search_service")
+
+
+class BlockingAgent:
+    """Agent stub whose search waits until released."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.response = SimpleNamespace(success=False, error=None)
+
+    async def search(self, request):
+        self.calls += 1
+        await self.release.wait()
+        return self.response
+
+
+def make_request(query: str = "python asyncio"):
+    return SimpleNamespace(query=query, num_results=10, lang="en", safe="active", region=None)
+
+
+async def test_follower_survives_cancelled_leader():
+    agent = BlockingAgent()
+    service = search_service.SearchService(agent)
+
+    leader = asyncio.create_task(service.search(make_request()))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(service.search(make_request()))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+    agent.release.set()
+    assert await follower is agent.response
+    assert agent.calls == 1
+    assert not service._inflight
+
+
+async def test_batch_search_survives_cancelled_leader():
+    agent = BlockingAgent()
+    service = search_service.SearchService(agent)
+
+    leader = asyncio.create_task(service.search(make_request()))
+    await asyncio.sleep(0)
+    batch = asyncio.create_task(service.batch_search([make_request(), make_request()]))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    agent.release.set()
+
+    responses = await batch
+    assert responses == [agent.response, agent.response]
+    assert agent.calls == 1
@@ -1,12 +1,12 @@
 from .fetch import (
-    base_fetch_url, batch_rival_retrieve, stream_fetch, 
+    base_fetch_url, stream_fetch, 
     rival_retrieve, google_search_fetch, cleanup_resources
 )
 from .bypass import (
     get_proxies, refresh_proxies, detect_paywall, select_proxy,
     test_proxy, get_archive_url
 )
-from .extract import extract_triples, extract_search_results
+from .extract import extract_triples, iter_triples, extract_search_results
 from .search import (
     MultiEngineSearch, multi_engine_search, process_images_ocr
 )
@@ -18,7 +18,6 @@ from .traverse import (
 
 __all__ = [
     'base_fetch_url',
-    'batch_rival_retrieve', 
     'stream_fetch',
     'rival_retrieve',
     'google_search_fetch',
@@ -30,6 +29,7 @@ __all__ = [
     'test_proxy',
     'get_archive_url',
     'extract_triples',
+    'iter_triples',
     'extract_search_results',
     'MultiEngineSearch',
     'multi_engine_search',
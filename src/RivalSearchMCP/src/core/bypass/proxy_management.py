@@ -6,6 +6,7 @@ Handles proxy fetching, testing, and selection.
 
 import random
 import asyncio
+import time
 import httpx
 import re
 from typing import List, Optional
@@ -21,44 +22,47 @@ PROXY_SOURCES = [
     "https://raw.githubusercontent.com/sunny9577/proxy-scraper/master/proxies.txt"
 ]
 
+# Refresh the proxy list every 30 minutes
+PROXY_REFRESH_INTERVAL = 1800
+
+# IP:PORT patterns
+PROXY_PATTERN = re.compile(r'(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}:\d+)')
+
 proxies = []
-last_proxy_refresh = 0
+last_proxy_refresh = 0.0
+_refresh_task: Optional[asyncio.Task] = None
 
 
 async def get_proxies(count: int = 20) -> List[str]:
-    """Get proxies from multiple sources with enhanced reliability."""
-    global proxies, last_proxy_refresh
+    """Get proxies from multiple sources with enhanced reliability.
     
-    # Check if we need to refresh (every 30 minutes)
-    current_time = asyncio.get_event_loop().time()
-    if current_time - last_proxy_refresh < 1800 and len(proxies) > 5:
+    A stale list is returned immediately while a refresh runs in the
+    background; callers only wait when there are no usable proxies yet.
+    """
+    if time.monotonic() - last_proxy_refresh < PROXY_REFRESH_INTERVAL and len(proxies) > 5:
         return proxies[:count]
     
-    all_proxies = []
+    refresh = _start_refresh()
+    if len(proxies) <= 5:
+        await asyncio.shield(refresh)
     
-    for source in PROXY_SOURCES:
-        try:
-            client = await get_http_client()
-            response = await client.get(source, timeout=10.0)
-            if response.status_code == 200:
-                content = response.text
-                
-                # Extract IP:PORT patterns
-                proxy_pattern = r'(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}:\d+)'
-                found_proxies = re.findall(proxy_pattern, content)
-                
-                # Validate proxies
-                valid_proxies = []
-                for proxy in found_proxies[:10]:  # Test first 10 from each source
-                    if await test_proxy(proxy):
-                        valid_proxies.append(proxy)
-                
-                all_proxies.extend(valid_proxies)
-                logger.info(f"Found {len(valid_proxies)} valid proxies from {source}")
-                
-        except Exception as e:
-            logger.warning(f"Failed to fetch proxies from {source}: {e}")
-            continue
+    return proxies[:count]
+
+
+def _start_refresh() -> asyncio.Task:
+    """Start a proxy refresh unless one is already running."""
+    global _refresh_task
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.create_task(_refresh())
+    return _refresh_task
+
+
+async def _refresh() -> None:
+    """Fetch and test proxies from every source concurrently."""
+    global proxies, last_proxy_refresh
+    
+    results = await asyncio.gather(*(_fetch_source(source) for source in PROXY_SOURCES))
+    all_proxies = [proxy for found in results for proxy in found]
     
     # If no proxies found from online sources, use some fallback proxies
     if not all_proxies:
@@ -69,10 +73,29 @@ async def get_proxies(count: int = 20) -> List[str]:
         all_proxies = fallback_proxies
     
     proxies = all_proxies
-    last_proxy_refresh = current_time
-    logger.info(f"Total valid proxies: {len(proxies)}")
-    
-    return proxies[:count]
+    last_proxy_refresh = time.monotonic()
+    logger.info("Total valid proxies: %s", len(proxies))
+
+
+async def _fetch_source(source: str) -> List[str]:
+    """Fetch candidate proxies from one source and keep the working ones."""
+    try:
+        client = await get_http_client()
+        response = await client.get(source, timeout=10.0)
+        if response.status_code != 200:
+            return []
+        
+        # Validate proxies
+        candidates = PROXY_PATTERN.findall(response.text)[:10]  # Test first 10 from each source
+        checks = await asyncio.gather(*(test_proxy(proxy) for proxy in candidates))
+        valid_proxies = [proxy for proxy, ok in zip(candidates, checks, strict=True) if ok]
+        
+        logger.info("Found %s valid proxies from %s", len(valid_proxies), source)
+        return valid_proxies
+        
+    except Exception as e:
+        logger.warning(f"Failed to fetch proxies from {source}: {e}")
+        return []
 
 
 async def test_proxy(proxy: str) -> bool:
@@ -87,9 +110,8 @@ async def test_proxy(proxy: str) -> bool:
 
 
 async def refresh_proxies():
-    """Refresh the proxy list."""
-    global proxies
-    proxies = await get_proxies(20)
+    """Refresh the proxy list, joining a refresh that is already running."""
+    await asyncio.shield(_start_refresh())
 
 
 def select_proxy() -> Optional[str]:
@@ -5,7 +5,18 @@ Handles extraction of search results from HTML content.
 """
 
 from typing import List, Dict, cast
-from bs4 import BeautifulSoup, Tag
+from bs4 import Tag
+
+from utils import create_soup
+
+# Result layouts tried in order; later ones cover older or alternate SERP markup
+SELECTOR_SETS = (
+    {'container': '#search div[data-hveid]', 'title': 'h3', 'snippet': '.VwiC3b'},
+    {'container': '#rso div[data-hveid]', 'title': 'h3', 'snippet': '[data-sncf="1"]'},
+    {'container': '.g', 'title': 'h3', 'snippet': 'div[style*="webkit-line-clamp"]'},
+    {'container': 'div[jscontroller][data-hveid]', 'title': 'h3', 'snippet': 'div[role="text"]'}
+)
+ALT_SNIPPET_SELECTORS = ('.VwiC3b', '[data-sncf="1"]', 'div[style*="webkit-line-clamp"]', 'div[role="text"]')
 
 
 def extract_search_results(html: str, max_results: int = 10) -> List[Dict[str, str]]:
@@ -19,19 +30,11 @@ def extract_search_results(html: str, max_results: int = 10) -> List[Dict[str, s
     Returns:
         List of dictionaries with title, link, and snippet
     """
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = create_soup(html)
     results = []
     seen_urls = set()
-    
-    selector_sets = [
-        {'container': '#search div[data-hveid]', 'title': 'h3', 'snippet': '.VwiC3b'},
-        {'container': '#rso div[data-hveid]', 'title': 'h3', 'snippet': '[data-sncf="1"]'},
-        {'container': '.g', 'title': 'h3', 'snippet': 'div[style*="webkit-line-clamp"]'},
-        {'container': 'div[jscontroller][data-hveid]', 'title': 'h3', 'snippet': 'div[role="text"]'}
-    ]
-    alt_snippet_selectors = ['.VwiC3b', '[data-sncf="1"]', 'div[style*="webkit-line-clamp"]', 'div[role="text"]']
 
-    for selectors in selector_sets:
+    for selectors in SELECTOR_SETS:
         if len(results) >= max_results:
             break
         containers = soup.select(selectors['container'])
@@ -75,7 +78,7 @@ def extract_search_results(html: str, max_results: int = 10) -> List[Dict[str, s
             if snippet_elem:
                 snippet = snippet_elem.text.strip()
             else:
-                for alt in alt_snippet_selectors:
+                for alt in ALT_SNIPPET_SELECTORS:
                     elem = container_tag.select_one(alt)
                     if elem:
                         snippet = elem.text.strip()
@@ -5,7 +5,28 @@ Handles extraction of subject-predicate-object triples from text content.
 """
 
 import re
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
+
+# Sentence boundary: whitespace after '.' or '?', except after abbreviations
+SENTENCE_SPLIT_RE = re.compile(r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?)\s')
+
+
+def iter_triples(text: str) -> Iterator[Tuple[str, str, str]]:
+    """
+    Lazily extract subject-predicate-object triples from text.
+    
+    Args:
+        text: Input text to extract triples from
+        
+    Yields:
+        (subject, predicate, object) tuples
+    """
+    for sentence in SENTENCE_SPLIT_RE.split(text):
+        # Only the first two words are needed; the rest stays one string
+        words = sentence.split(maxsplit=2)
+        if len(words) > 2:
+            subject, predicate, obj = words
+            yield subject, predicate, obj.rstrip()
 
 
 def extract_triples(text: str) -> List[Tuple[str, str, str]]:
@@ -18,13 +39,4 @@ def extract_triples(text: str) -> List[Tuple[str, str, str]]:
     Returns:
         List of (subject, predicate, object) tuples
     """
-    triples = []
-    sentences = re.split(r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?)\s', text)
-    for sentence in sentences:
-        words = sentence.split()
-        if len(words) > 2:
-            subject = words[0]
-            predicate = words[1]
-            obj = ' '.join(words[2:])
-            triples.append((subject, predicate, obj))
-    return triples
+    return list(iter_triples(text))
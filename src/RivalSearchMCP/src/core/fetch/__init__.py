@@ -1,10 +1,9 @@
 """
 Core fetching and retrieval functionality for RivalSearchMCP.
-Componentized fetch functionality with base fetching, batch retrieval, and enhanced retrieval.
+Componentized fetch functionality with base fetching and enhanced retrieval.
 """
 
 from .base_fetch import base_fetch_url, stream_fetch
-from .batch_retrieval import batch_rival_retrieve
 from .enhanced_retrieval import rival_retrieve, google_search_fetch
 from .resource_management import cleanup_resources
 
@@ -13,9 +12,6 @@ __all__ = [
     'base_fetch_url',
     'stream_fetch',
     
-    # Batch Retrieval
-    'batch_rival_retrieve',
-    
     # Enhanced Retrieval
     'rival_retrieve',
     'google_search_fetch',
@@ -4,7 +4,10 @@ Base fetching functionality for RivalSearchMCP.
 Core URL fetching with optimized performance.
 """
 
-from typing import Optional
+import asyncio
+from typing import Dict, Optional, Tuple
+
+from cachetools import TTLCache
 
 from logger import logger
 from utils import (
@@ -14,11 +17,21 @@ from utils import (
 # Performance configuration
 STREAM_TIMEOUT = 30.0
 
+# Recently fetched pages, so repeated tool calls on a URL skip the network
+FETCH_CACHE_SIZE = 128
+FETCH_CACHE_TTL = 300.0
+
+_fetch_cache: TTLCache = TTLCache(maxsize=FETCH_CACHE_SIZE, ttl=FETCH_CACHE_TTL)
+_inflight_fetches: Dict[Tuple[str, bool], "asyncio.Task[Optional[str]]"] = {}
+
 
 async def base_fetch_url(url: str, use_cloudscraper: bool = False) -> Optional[str]:
     """
     Fetch content from a URL with optimized performance.
     
+    Successful fetches are cached for FETCH_CACHE_TTL seconds, and concurrent
+    calls for the same URL share a single request.
+    
     Args:
         url: URL to fetch
         use_cloudscraper: Whether to use cloudscraper for bypassing
@@ -26,10 +39,52 @@ async def base_fetch_url(url: str, use_cloudscraper: bool = False) -> Optional[s
     Returns:
         HTML content or None if failed
     """
+    key = (url, use_cloudscraper)
+    cached = _fetch_cache.get(key)
+    if cached is not None:
+        logger.debug("Fetch cache hit for %s", url)
+        return cached
+    
+    # Join an identical fetch that is already in flight. The fetch runs in its
+    # own task so cancelling one caller never cancels it for the others.
+    task = _inflight_fetches.get(key)
+    if task is None:
+        task = asyncio.create_task(_fetch_and_cache(url, use_cloudscraper))
+        _inflight_fetches[key] = task
+        task.add_done_callback(lambda done: _finish_inflight(key, done))
+    
+    return await asyncio.shield(task)
+
+
+async def _fetch_and_cache(url: str, use_cloudscraper: bool) -> Optional[str]:
+    """Fetch a URL and cache the content if the fetch succeeded."""
+    content = await _fetch_uncached(url, use_cloudscraper)
+    if content is not None:
+        _fetch_cache[(url, use_cloudscraper)] = content
+    return content
+
+
+def _finish_inflight(key: Tuple[str, bool], task: "asyncio.Task[Optional[str]]") -> None:
+    """Forget a finished in-flight fetch."""
+    if _inflight_fetches.get(key) is task:
+        del _inflight_fetches[key]
+    # Awaiting callers re-raise any error; mark it retrieved in case none are left
+    if not task.cancelled():
+        task.exception()
+
+
+def clear_fetch_cache() -> None:
+    """Drop all cached page fetches."""
+    _fetch_cache.clear()
+
+
+async def _fetch_uncached(url: str, use_cloudscraper: bool) -> Optional[str]:
+    """Fetch a URL without consulting the cache."""
     try:
         if use_cloudscraper:
             scraper = await get_cloudscraper_session()
-            response = scraper.get(url, timeout=STREAM_TIMEOUT)
+            # cloudscraper is synchronous (DNS, connect and read); keep it off the event loop
+            response = await asyncio.to_thread(scraper.get, url, timeout=STREAM_TIMEOUT)
             response.raise_for_status()
             return response.text
         else:
@@ -64,11 +119,12 @@ async def stream_fetch(
         async with client.stream('GET', url, timeout=timeout) as response:
             response.raise_for_status()
             
-            content = []
+            # Decode once at the end so multi-byte characters split across chunks survive
+            content = bytearray()
             async for chunk in response.aiter_bytes(chunk_size=chunk_size):
-                content.append(chunk.decode('utf-8', errors='ignore'))
+                content.extend(chunk)
             
-            return ''.join(content)
+            return content.decode('utf-8', errors='ignore')
             
     except Exception as e:
         logger.error(f"Stream fetch failed for {url}: {e}")
@@ -4,7 +4,8 @@ Enhanced retrieval functionality for RivalSearchMCP.
 Handles URLs, search queries, and Google search integration.
 """
 
-from typing import Union, List, Dict, Any
+import asyncio
+from typing import Union, List, Dict, Any, Optional
 
 from logger import logger
 from utils import clean_html_to_markdown, extract_structured_content, format_search_results
@@ -12,56 +13,101 @@ from .base_fetch import base_fetch_url
 from ..search import GoogleSearchScraper
 
 
+# Prefix that marks a resource as a search query rather than a URL
+SEARCH_PREFIX = "search:"
+
+
 async def rival_retrieve(
     resource: Union[str, List[str]],
     limit: int = 5,
-    max_length: int = 2000
+    max_length: int = 2000,
+    max_workers: int = 10
 ) -> Union[str, List[Dict[str, Any]]]:
     """
     Enhanced retrieval function that handles both URLs and search queries.
     
     Args:
-        resource: URL, list of URLs, or search query
-        limit: Maximum number of results
+        resource: URL, search query (optionally prefixed with "search:"), or a
+            list mixing both
+        limit: Maximum number of search results
         max_length: Maximum content length per result
+        max_workers: Maximum list items retrieved concurrently
         
     Returns:
-        Formatted string or list of results
+        Formatted string, or for a list one result dict per item with
+        resource, content and success keys
     """
     if isinstance(resource, list):
-        # Handle list of URLs
-        from .batch_retrieval import batch_rival_retrieve
-        results = await batch_rival_retrieve(resource[:limit])
-        return results
+        # Each item takes its own URL or search path, at most max_workers at a time
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def retrieve_bounded(item: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await _retrieve_item(item, limit, max_length)
+
+        return list(await asyncio.gather(*(retrieve_bounded(item) for item in resource)))
     elif resource.startswith(('http://', 'https://')):
         # Handle single URL
-        html_content = await base_fetch_url(resource)
-        if html_content:
-            # Process HTML to clean markdown
-            clean_content = clean_html_to_markdown(html_content, resource)
-            return clean_content[:max_length] + "..." if len(clean_content) > max_length else clean_content
-        return f"Failed to retrieve content from {resource}"
+        content = await _retrieve_url(resource, max_length)
+        return content if content is not None else f"Failed to retrieve content from {resource}"
     else:
         # Handle search query
+        query = _search_query(resource)
         try:
-            scraper = GoogleSearchScraper()
-            search_results = scraper.search_google(term=resource, num_results=limit)
-            if search_results:
-                formatted_results = []
-                for result in search_results:
-                    formatted_results.append({
-                        'title': result.title,
-                        'url': result.url,
-                        'snippet': result.description[:max_length] + "..." if len(result.description) > max_length else result.description,
-                        'domain': result.domain
-                    })
-                # Use the new formatting function
-                return format_search_results(formatted_results)
-            else:
-                return f"No search results found for: {resource}"
+            content = await _retrieve_search(query, limit, max_length)
+            return content if content is not None else f"No search results found for: {query}"
         except Exception as e:
-            logger.error(f"Search failed for '{resource}': {e}")
-            return f"Search failed for '{resource}': {str(e)}"
+            logger.error(f"Search failed for '{query}': {e}")
+            return f"Search failed for '{query}': {str(e)}"
+
+
+def _search_query(resource: str) -> str:
+    """Strip the optional search prefix from a query."""
+    return resource[len(SEARCH_PREFIX):].strip() if resource.startswith(SEARCH_PREFIX) else resource
+
+
+async def _retrieve_item(item: str, limit: int, max_length: int) -> Dict[str, Any]:
+    """Retrieve one list item through its URL or search path."""
+    try:
+        if item.startswith(('http://', 'https://')):
+            content = await _retrieve_url(item, max_length)
+        else:
+            content = await _retrieve_search(_search_query(item), limit, max_length)
+        return {'resource': item, 'content': content, 'success': content is not None}
+    except Exception as e:
+        logger.warning(f"Retrieval failed for {item}: {e}")
+        return {'resource': item, 'content': None, 'success': False, 'error': str(e)}
+
+
+async def _retrieve_url(url: str, max_length: int) -> Optional[str]:
+    """Fetch a URL as clean markdown, or None if the fetch failed."""
+    html_content = await base_fetch_url(url)
+    if not html_content:
+        return None
+    
+    # Process HTML to clean markdown
+    clean_content = clean_html_to_markdown(html_content, url)
+    return clean_content[:max_length] + "..." if len(clean_content) > max_length else clean_content
+
+
+async def _retrieve_search(query: str, limit: int, max_length: int) -> Optional[str]:
+    """Search Google and format the results, or None if nothing was found."""
+    scraper = GoogleSearchScraper()
+    # The scraper is synchronous; run it in a thread so concurrent retrievals overlap
+    search_results = await asyncio.to_thread(scraper.search_google, term=query, num_results=limit)
+    if not search_results:
+        return None
+    
+    formatted_results = []
+    for result in search_results:
+        formatted_results.append({
+            'title': result.title,
+            'url': result.url,
+            'snippet': result.description[:max_length] + "..." if len(result.description) > max_length else result.description,
+            'domain': result.domain
+        })
+    # Use the new formatting function
+    return format_search_results(formatted_results)
 
 
 async def google_search_fetch(query: str, num_results: int = 5) -> str:
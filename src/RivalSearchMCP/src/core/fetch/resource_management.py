@@ -5,8 +5,10 @@ Handles cleanup and resource management for HTTP clients.
 """
 
 from utils import close_http_clients
+from .base_fetch import clear_fetch_cache
 
 
 async def cleanup_resources():
     """Clean up HTTP clients and free resources."""
+    clear_fetch_cache()
     await close_http_clients()
@@ -9,9 +9,9 @@ import time
 import random
 from datetime import datetime
 from typing import List, Optional
-from bs4 import BeautifulSoup
 import cloudscraper
 
+from utils import create_soup
 from .models import GoogleSearchResult
 from .html_parser import GoogleSearchHTMLParser
 
@@ -137,7 +137,7 @@ class GoogleSearchScraper:
                     region
                 )
                 
-                soup = BeautifulSoup(response.text, "html.parser")
+                soup = create_soup(response.text)
                 new_results = 0
                 
                 # Parse search results
@@ -137,7 +137,7 @@ class GoogleSearchScraper:
                     region
                 )
                 
-                soup = BeautifulSoup(response.text, "html.parser")
+                soup = BeautifulSoup(response.text, "lxml")
                 new_results = 0
                 
                 # Parse search results
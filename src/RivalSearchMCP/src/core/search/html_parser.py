@@ -144,7 +144,7 @@ class GoogleSearchHTMLParser:
                     results.append(search_result)
                     
                 except Exception as e:
-                    logger.debug(f"Error parsing individual result: {e}")
+                    logger.debug("Error parsing individual result: %s", e)
                     continue
             
         except Exception as e:
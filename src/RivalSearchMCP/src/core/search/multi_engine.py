@@ -64,8 +64,8 @@ class MultiEngineSearch:
         if engines is None:
             engines = ["google"] + list(ADDITIONAL_ENGINES.keys())
         
-        logger.info(f"🔍 Multi-engine search for: {query}")
-        logger.info(f"🚀 Using engines: {', '.join(engines)}")
+        logger.info("🔍 Multi-engine search for: %s", query)
+        logger.info("🚀 Using engines: %s", ', '.join(engines))
         
         # Handle Google search using the dedicated scraper
         if "google" in engines:
@@ -85,7 +85,7 @@ class MultiEngineSearch:
                         'search_features': result.search_features
                     })
                 self.results["google"] = google_dict_results
-                logger.info(f"✅ google: {len(google_dict_results)} results")
+                logger.info("✅ google: %s results", len(google_dict_results))
             except Exception as e:
                 logger.error(f"❌ google search failed: {e}")
                 self.failed_engines.append("google")
@@ -111,7 +111,7 @@ class MultiEngineSearch:
                         self.failed_engines.append(engine)
                     else:
                         self.results[engine] = result
-                        logger.info(f"✅ {engine}: {len(result) if isinstance(result, list) else 0} results")
+                        logger.info("✅ %s: %s results", engine, len(result) if isinstance(result, list) else 0)
         
         return self._aggregate_results()
     
@@ -164,7 +164,7 @@ class MultiEngineSearch:
         """Parse Bing search results."""
         results = []
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = BeautifulSoup(html, 'lxml')
             
             # Find search result containers
             result_containers = soup.find_all('li', class_='b_algo')
@@ -197,7 +197,7 @@ class MultiEngineSearch:
                         }
                         results.append(result)
                 except Exception as e:
-                    logger.debug(f"Error parsing Bing result: {e}")
+                    logger.debug("Error parsing Bing result: %s", e)
                     continue
                     
         except Exception as e:
@@ -209,7 +209,7 @@ class MultiEngineSearch:
         """Parse DuckDuckGo search results."""
         results = []
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = BeautifulSoup(html, 'lxml')
             
             # Find search result containers
             result_containers = soup.find_all('div', class_='result')
@@ -235,7 +235,7 @@ class MultiEngineSearch:
                         }
                         results.append(result)
                 except Exception as e:
-                    logger.debug(f"Error parsing DuckDuckGo result: {e}")
+                    logger.debug("Error parsing DuckDuckGo result: %s", e)
                     continue
                     
         except Exception as e:
@@ -247,7 +247,7 @@ class MultiEngineSearch:
         """Parse Yahoo search results."""
         results = []
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = BeautifulSoup(html, 'lxml')
             
             # Find search result containers
             result_containers = soup.find_all('div', class_='dd')
@@ -280,7 +280,7 @@ class MultiEngineSearch:
                         }
                         results.append(result)
                 except Exception as e:
-                    logger.debug(f"Error parsing Yahoo result: {e}")
+                    logger.debug("Error parsing Yahoo result: %s", e)
                     continue
                     
         except Exception as e:
@@ -292,7 +292,7 @@ class MultiEngineSearch:
         """Parse generic search results."""
         results = []
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = BeautifulSoup(html, 'lxml')
             
             # Find all links
             links = soup.find_all('a', href=True)
@@ -313,7 +313,7 @@ class MultiEngineSearch:
                         }
                         results.append(result)
                 except Exception as e:
-                    logger.debug(f"Error parsing generic result: {e}")
+                    logger.debug("Error parsing generic result: %s", e)
                     continue
                     
         except Exception as e:
@@ -365,7 +365,7 @@ class MultiEngineSearch:
         with open(filename, 'w', encoding='utf-8') as file:
             json.dump(aggregated, file, indent=2)
         
-        logger.info(f"📄 Multi-engine search results saved to {filename}")
+        logger.info("📄 Multi-engine search results saved to %s", filename)
         return filename
 
 
@@ -5,16 +5,247 @@ Handles OCR processing of images from web content.
 """
 
 import asyncio
+import os
+import tempfile
+import threading
 import httpx
-from typing import List, cast
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, cast
 from PIL import Image
 from io import BytesIO
-from pytesseract import image_to_string
+from pytesseract import TesseractError, image_to_string
 from bs4 import BeautifulSoup, Tag
-from urllib.parse import urlparse
+from urllib.parse import urljoin
 
 from logger import logger
 
+# Image downloads share one pooled client; these bound its connections
+MAX_IMAGE_CONNECTIONS = 32
+MAX_IMAGE_KEEPALIVE = 16
+IMAGE_TIMEOUT = 10.0
+
+# Images larger than this are skipped, and never buffered past the limit
+MAX_IMAGE_BYTES = 5 * 1024 * 1024
+IMAGE_CHUNK_SIZE = 64 * 1024
+
+# Each Tesseract process OCRs on one core; parallelism comes from running
+# several processes, since OpenMP threading inside Tesseract scales poorly
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+# tesserocr keeps the engine in-process; imported after OMP_THREAD_LIMIT is set
+try:
+    from tesserocr import PyTessBaseAPI
+except ImportError:  # fall back to pytesseract's tesseract subprocess
+    PyTessBaseAPI = None
+
+OCR_WORKERS = min(8, os.cpu_count() or 1)
+_ocr_pool = ThreadPoolExecutor(max_workers=OCR_WORKERS, thread_name_prefix='ocr')
+
+# One tesserocr engine per worker thread; an engine is not thread-safe
+_tess_local = threading.local()
+
+# Set once an engine fails to initialize (e.g. missing language data), after
+# which every batch goes straight to the tesseract subprocess
+_tesserocr_failed = False
+_tesserocr_lock = threading.Lock()
+
+# Tesseract runtime grows with pixel count; larger images are scaled down to fit
+MAX_OCR_DIMENSION = 1600
+
+# Images OCR'd per page; later <img> tags are ignored to bound memory and time
+MAX_OCR_IMAGES = 20
+
+# Tesseract ends every page of a multi-image run with this separator
+OCR_PAGE_SEPARATOR = '\f'
+
+
+async def _download_image(client: httpx.AsyncClient, url: str) -> Optional[bytes]:
+    """
+    Download an image body, giving up as soon as it exceeds MAX_IMAGE_BYTES.
+    
+    Args:
+        client: Shared HTTP client
+        url: Absolute image URL
+        
+    Returns:
+        Image bytes, or None if the image is too large
+    """
+    async with client.stream('GET', url) as response:
+        content_length = response.headers.get('content-length')
+        if content_length and content_length.isdigit() and int(content_length) > MAX_IMAGE_BYTES:
+            logger.debug("Skipping %s: declared size %s bytes exceeds limit", url, content_length)
+            return None
+        
+        # Content-Length can be missing or wrong, so enforce the cap while reading
+        body = bytearray()
+        async for chunk in response.aiter_bytes(IMAGE_CHUNK_SIZE):
+            body.extend(chunk)
+            if len(body) > MAX_IMAGE_BYTES:
+                logger.debug("Skipping %s: body exceeds %s bytes", url, MAX_IMAGE_BYTES)
+                return None
+        
+        return bytes(body)
+
+
+def _otsu_threshold(histogram: List[int]) -> int:
+    """Pick the gray level that best separates a histogram into two classes (Otsu)."""
+    total = sum(histogram)
+    sum_all = sum(level * count for level, count in enumerate(histogram))
+    sum_background = 0
+    weight_background = 0
+    best_level = 127
+    best_variance = 0.0
+    
+    for level, count in enumerate(histogram):
+        weight_background += count
+        if weight_background == 0:
+            continue
+        weight_foreground = total - weight_background
+        if weight_foreground == 0:
+            break
+        
+        sum_background += level * count
+        mean_background = sum_background / weight_background
+        mean_foreground = (sum_all - sum_background) / weight_foreground
+        variance = weight_background * weight_foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_variance = variance
+            best_level = level
+    
+    return best_level
+
+
+def _preprocess_image(img: Image.Image) -> Image.Image:
+    """
+    Prepare an image for OCR: flatten transparency, grayscale, downscale and binarize.
+    
+    Tesseract reads clean 1-bit input faster and more accurately than raw
+    photos or anti-aliased graphics.
+    
+    Args:
+        img: Decoded image
+        
+    Returns:
+        Binarized image no larger than MAX_OCR_DIMENSION on either side
+    """
+    # Transparent pixels would turn black in grayscale; put them on white like a browser
+    if img.mode in ('RGBA', 'LA', 'PA') or (img.mode == 'P' and 'transparency' in img.info):
+        img = Image.alpha_composite(Image.new('RGBA', img.size, 'white'), img.convert('RGBA'))
+    
+    # convert() always copies, even to the same mode; the decoded image is not reused
+    if img.mode != 'L':
+        img = img.convert('L')
+    img.thumbnail((MAX_OCR_DIMENSION, MAX_OCR_DIMENSION))
+    
+    threshold = _otsu_threshold(img.histogram())
+    lut = [0] * (threshold + 1) + [255] * (255 - threshold)
+    return img.point(lut, '1')
+
+
+def _decode_image(data: bytes) -> Image.Image:
+    """
+    Decode downloaded image bytes straight into OCR-ready form.
+    
+    Reducing right after decoding means only small 1-bit bitmaps are held
+    while the rest of the page's images load, never full-size RGB ones.
+    
+    Args:
+        data: Raw image bytes
+        
+    Returns:
+        Preprocessed image
+    """
+    img = Image.open(BytesIO(data))
+    # JPEG decoders can scale down and emit grayscale while decoding; a no-op for other formats
+    img.draft('L', (MAX_OCR_DIMENSION, MAX_OCR_DIMENSION))
+    return _preprocess_image(img)
+
+
+def _ocr_batch(images: List[Image.Image]) -> List[str]:
+    """
+    OCR several images with a single Tesseract process.
+    
+    Tesseract treats a .txt input as a list of image paths, so the language
+    data is loaded once per batch instead of once per image.
+    
+    Args:
+        images: Decoded images
+        
+    Returns:
+        Extracted text for each image, in order
+    """
+    with tempfile.TemporaryDirectory(prefix='rival_ocr_') as tmpdir:
+        paths = []
+        for i, img in enumerate(images):
+            if img.mode not in ('1', 'L', 'RGB', 'RGBA'):
+                img = img.convert('RGB')
+            path = os.path.join(tmpdir, f'{i}.png')
+            img.save(path)
+            paths.append(path)
+        
+        list_path = os.path.join(tmpdir, 'images.txt')
+        with open(list_path, 'w') as f:
+            f.write('\n'.join(paths))
+        
+        text = image_to_string(list_path)
+    
+    return text.split(OCR_PAGE_SEPARATOR)[:len(images)]
+
+
+def _ocr_in_process(images: List[Image.Image]) -> List[str]:
+    """
+    OCR images with this thread's tesserocr engine.
+    
+    The engine loads its language data once and is reused for every later
+    image on the same worker, with no process spawned per call.
+    
+    Args:
+        images: Decoded images
+        
+    Returns:
+        Extracted text for each image that was read
+    """
+    api = getattr(_tess_local, 'api', None)
+    if api is None:
+        api = PyTessBaseAPI()
+        _tess_local.api = api
+    
+    texts = []
+    for img in images:
+        try:
+            api.SetImage(img)
+            texts.append(api.GetUTF8Text())
+        except (RuntimeError, ValueError) as e:
+            logger.debug("OCR failed for image: %s", e)
+    return texts
+
+
+def _ocr_images(images: List[Image.Image]) -> List[str]:
+    """OCR images in-process if tesserocr is available, otherwise in one Tesseract batch."""
+    global _tesserocr_failed
+    if PyTessBaseAPI is not None and not _tesserocr_failed:
+        try:
+            return _ocr_in_process(images)
+        except RuntimeError as e:
+            # Raised when the engine cannot initialize; the same error would recur
+            with _tesserocr_lock:
+                if not _tesserocr_failed:
+                    _tesserocr_failed = True
+                    logger.warning("tesserocr unavailable, using tesseract subprocess: %s", e)
+    
+    try:
+        return _ocr_batch(images)
+    except (OSError, TesseractError) as e:
+        logger.debug("Batch OCR failed, retrying images one by one: %s", e)
+    
+    texts = []
+    for img in images:
+        try:
+            texts.append(image_to_string(img))
+        except (OSError, TesseractError) as e:
+            logger.debug("OCR failed for image: %s", e)
+    return texts
+
 
 async def process_images_ocr(soup: BeautifulSoup, base_url: str) -> List[str]:
     """
@@ -32,29 +263,63 @@ async def process_images_ocr(soup: BeautifulSoup, base_url: str) -> List[str]:
         img_tag = cast(Tag, img)
         src = img_tag.get('src', '')
         if src:
-            images.append(src)
+            # urljoin handles absolute, root-relative, relative and scheme-relative sources
+            img_url = urljoin(base_url, str(src))
+            if img_url.startswith(('http://', 'https://')):
+                images.append(img_url)
+    
+    # Repeated images (icons, spacers) are OCR'd once; cap the rest
+    images = list(dict.fromkeys(images))[:MAX_OCR_IMAGES]
+    
+    failed_images = 0
+    
+    loop = asyncio.get_running_loop()
     
-    async def ocr_img(img_src: str) -> str:
-        """Process a single image with OCR."""
-        img_url = urlparse(base_url)._replace(path=img_src).geturl() if not img_src.startswith('http') else img_src
+    async def load_img(client: httpx.AsyncClient, img_url: str) -> Optional[Image.Image]:
+        """Download a single image and decode it on the worker pool."""
+        nonlocal failed_images
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(img_url, timeout=10)
-            img = Image.open(BytesIO(resp.content))
-            return image_to_string(img)
-        except Exception as e:
-            logger.debug(f"OCR failed for {img_url}: {e}")
-            return ""
-    
-    tasks = [ocr_img(src) for src in images]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    
-    # Filter out exceptions and empty results
-    valid_results = []
+            data = await _download_image(client, img_url)
+            if data is None:
+                return None
+            return await loop.run_in_executor(_ocr_pool, _decode_image, data)
+        except (httpx.HTTPError, OSError, ValueError, Image.DecompressionBombError) as e:
+            # Download and decode failures (PIL raises OSError subclasses)
+            logger.debug("Image load failed for %s: %s", img_url, e)
+            failed_images += 1
+            return None
+    
+    # One client for every image so same-host downloads reuse connections
+    async with httpx.AsyncClient(
+        http2=True,
+        timeout=IMAGE_TIMEOUT,
+        limits=httpx.Limits(
+            max_connections=MAX_IMAGE_CONNECTIONS,
+            max_keepalive_connections=MAX_IMAGE_KEEPALIVE
+        )
+    ) as client:
+        tasks = [load_img(client, img_url) for img_url in images]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+    
+    loaded = []
     for result in results:
-        if isinstance(result, Exception):
-            logger.debug(f"OCR task failed: {result}")
-        elif isinstance(result, str) and result.strip():
-            valid_results.append(result.strip())
+        if isinstance(result, BaseException):
+            failed_images += 1
+            logger.debug("Image task failed: %s", result)
+        elif result is not None:
+            loaded.append(result)
+    
+    if failed_images:
+        logger.info("Failed to load %s of %s images from %s", failed_images, len(images), base_url)
+    
+    if not loaded:
+        return []
+    
+    # Split the images into one batch per worker; each runs its own Tesseract process
+    per_worker = -(-len(loaded) // OCR_WORKERS)
+    batches = [loaded[i:i + per_worker] for i in range(0, len(loaded), per_worker)]
+    outputs = await asyncio.gather(*(loop.run_in_executor(_ocr_pool, _ocr_images, batch) for batch in batches))
+    texts = [text for output in outputs for text in output]
     
-    return valid_results
+    # Filter out empty results
+    return [text.strip() for text in texts if text.strip()]
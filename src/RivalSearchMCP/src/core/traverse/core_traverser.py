@@ -5,13 +5,17 @@ Main WebsiteTraverser class for crawling and exploring websites.
 """
 
 import asyncio
+import random
 import httpx
-from typing import List, Dict, Any, Optional, Set
+from collections import deque
+from typing import Deque, Iterator, List, Dict, Any, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse
 from datetime import datetime
 
+from selectolax.parser import HTMLParser
+
 from logger import logger
-from utils import create_soup, clean_text, clean_html_to_markdown, format_traversal_results
+from utils import clean_text, clean_html_to_markdown, format_traversal_results
 
 # Configuration
 MAX_DEPTH = 3
@@ -19,6 +23,49 @@ MAX_PAGES = 50
 DELAY_BETWEEN_REQUESTS = 0.5
 MAX_CONCURRENT_REQUESTS = 5
 
+# Links to these resources are never HTML pages; one str.endswith call checks them all
+NON_HTML_EXTENSIONS = (
+    '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
+    '.zip', '.tar', '.gz', '.rar', '.7z', '.exe', '.dmg',
+    '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.ico',
+    '.mp3', '.mp4', '.avi', '.mov', '.css', '.js', '.xml', '.rss'
+)
+
+
+def _normalize_url(url: str) -> str:
+    """Drop the fragment so in-page anchors are not treated as separate pages."""
+    # A single C-level split; the first '#' always starts the fragment
+    return url.partition('#')[0]
+
+
+def _fill_queue(
+    queue: Deque[Tuple[str, int]],
+    queued: Set[str],
+    frontier: Deque[Tuple[Iterator[str], int]],
+    budget: int
+) -> None:
+    """
+    Move links from fetched pages into the queue until budget URLs are pending.
+    
+    Pages of the same depth take turns, one link each, so the first page of a
+    level cannot use up the whole budget. Links are only drawn when needed,
+    and a failed fetch leaves room for the next call to draw more.
+    """
+    while frontier and len(queue) < budget:
+        links, depth = frontier.popleft()
+        link = next((link for link in links if link not in queued), None)
+        if link is None:
+            continue
+        
+        queued.add(link)
+        queue.append((link, depth))
+        
+        # Back of its depth group; deeper pages keep waiting behind it
+        position = 0
+        while position < len(frontier) and frontier[position][1] == depth:
+            position += 1
+        frontier.insert(position, (links, depth))
+
 
 class WebsiteTraverser:
     """Website traversal and crawling engine."""
@@ -28,6 +75,7 @@ class WebsiteTraverser:
         self.visited_urls: Set[str] = set()
         self.pages: List[Dict[str, Any]] = []
         self.semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._client: Optional[httpx.AsyncClient] = None
     
     async def traverse_website(
         self,
@@ -43,92 +91,107 @@ class WebsiteTraverser:
             start_url: Starting URL for traversal
             max_depth: Maximum depth to traverse
             max_pages: Maximum number of pages to visit
-            delay: Delay between requests
+            delay: Maximum random delay before each request
             
         Returns:
             List of page data dictionaries
         """
-        logger.info(f"🌐 Starting website traversal from: {start_url}")
-        logger.info(f"📊 Max depth: {max_depth}, Max pages: {max_pages}")
+        logger.info("🌐 Starting website traversal from: %s", start_url)
+        logger.info("📊 Max depth: %s, Max pages: %s", max_depth, max_pages)
         
         self.visited_urls.clear()
         self.pages.clear()
         
-        await self._traverse_recursive(start_url, 0, max_depth, max_pages, delay)
-        
-        logger.info(f"✅ Traversal completed. Visited {len(self.pages)} pages")
-        return self.pages
-    
-    async def _traverse_recursive(
-        self,
-        url: str,
-        depth: int,
-        max_depth: int,
-        max_pages: int,
-        delay: float
-    ):
-        """Recursively traverse the website."""
-        if (depth > max_depth or 
-            len(self.pages) >= max_pages or 
-            url in self.visited_urls):
-            return
-        
-        self.visited_urls.add(url)
+        # One pooled client per traversal so same-site requests reuse connections
+        self._client = httpx.AsyncClient(
+            timeout=30.0,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=MAX_CONCURRENT_REQUESTS * 2,
+                max_keepalive_connections=MAX_CONCURRENT_REQUESTS
+            )
+        )
         
         try:
-            async with self.semaphore:
-                page_data = await self._fetch_page(url)
-                if page_data:
+            # Breadth-first: each depth level is fetched concurrently
+            queue: Deque[Tuple[str, int]] = deque([(start_url, 0)])
+            # Every URL ever queued, so a link seen on many pages is queued once
+            queued: Set[str] = {start_url}
+            # Links of fetched pages not yet queued, in breadth-first order
+            frontier: Deque[Tuple[Iterator[str], int]] = deque()
+            
+            while len(self.pages) < max_pages:
+                _fill_queue(queue, queued, frontier, max_pages - len(self.pages))
+                if not queue:
+                    break
+                
+                # Take the rest of the shallowest level, but no more than can still be kept
+                level = queue[0][1]
+                remaining = max_pages - len(self.pages)
+                batch = []
+                while queue and queue[0][1] == level and len(batch) < remaining:
+                    url, depth = queue.popleft()
+                    self.visited_urls.add(url)
+                    batch.append((url, depth))
+                
+                results = await asyncio.gather(*(self._fetch_guarded(url, delay) for url, _ in batch))
+                
+                for (url, depth), fetched in zip(batch, results, strict=True):
+                    if not fetched or len(self.pages) >= max_pages:
+                        continue
+                    
+                    page_data, tree = fetched
                     self.pages.append(page_data)
-                    logger.info(f"📄 Fetched: {url} (depth {depth})")
+                    logger.info("📄 Fetched: %s (depth %s)", url, depth)
                     
-                    # Find links for next level
-                    if depth < max_depth and len(self.pages) < max_pages:
-                        links = self._extract_links(page_data['html'], url)
-                        await asyncio.sleep(delay)
-                        
-                        # Process links concurrently
-                        tasks = []
-                        for link in links[:10]:  # Limit concurrent tasks
-                            if link not in self.visited_urls:
-                                task = self._traverse_recursive(
-                                    link, depth + 1, max_depth, max_pages, delay
-                                )
-                                tasks.append(task)
-                        
-                        if tasks:
-                            await asyncio.gather(*tasks, return_exceptions=True)
-                            
-        except Exception as e:
-            logger.error(f"Error traversing {url}: {e}")
+                    # Links are queued by _fill_queue only as the page budget needs them
+                    if depth < max_depth:
+                        frontier.append((iter(self._extract_links(tree, url)[:10]), depth + 1))
+        finally:
+            await self._client.aclose()
+            self._client = None
+        
+        logger.info("✅ Traversal completed. Visited %s pages", len(self.pages))
+        return self.pages
+    
+    async def _fetch_guarded(self, url: str, delay: float) -> Optional[Tuple[Dict[str, Any], HTMLParser]]:
+        """Fetch a page under the concurrency limit after a random polite delay."""
+        async with self.semaphore:
+            await asyncio.sleep(random.uniform(0, delay))
+            return await self._fetch_page(url)
     
-    async def _fetch_page(self, url: str) -> Optional[Dict[str, Any]]:
-        """Fetch a single page."""
+    async def _fetch_page(self, url: str) -> Optional[Tuple[Dict[str, Any], HTMLParser]]:
+        """Fetch a single page, returning its data and the parsed tree for link extraction."""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                
-                return {
-                    'url': url,
-                    'title': self._extract_title(response.text),
-                    'content': self._extract_content(response.text),
-                    'html': response.text,
-                    'status_code': response.status_code,
-                    'timestamp': datetime.now().isoformat()
-                }
+            if self._client is None:
+                raise RuntimeError("Pages can only be fetched during traverse_website")
+            
+            response = await self._client.get(url)
+            response.raise_for_status()
+            
+            # One DOM per page, shared by title and link extraction
+            tree = HTMLParser(response.text)
+            
+            page_data = {
+                'url': url,
+                'title': self._extract_title(tree),
+                'content': self._extract_content(response.text),
+                'html': response.text,
+                'status_code': response.status_code,
+                'timestamp': datetime.now().isoformat()
+            }
+            return page_data, tree
                 
         except Exception as e:
-            logger.debug(f"Failed to fetch {url}: {e}")
+            logger.debug("Failed to fetch %s: %s", url, e)
             return None
     
-    def _extract_title(self, html: str) -> str:
-        """Extract page title from HTML."""
+    def _extract_title(self, tree: HTMLParser) -> str:
+        """Extract page title from a parsed page, falling back to the first <h1>."""
         try:
-            soup = create_soup(html)
-            title_tag = soup.find('title')
+            title_tag = tree.css_first('title') or tree.css_first('h1')
             if title_tag:
-                return clean_text(title_tag.get_text())
+                return clean_text(title_tag.text(strip=True))
             return ""
         except Exception:
             return ""
@@ -143,21 +206,23 @@ class WebsiteTraverser:
         except Exception:
             return ""
     
-    def _extract_links(self, html: str, base_url: str) -> List[str]:
-        """Extract links from HTML."""
+    def _extract_links(self, tree: HTMLParser, base_url: str) -> List[str]:
+        """Extract same-site page links from a parsed page."""
         links = []
         try:
-            soup = create_soup(html)
+            base_domain = urlparse(base_url).netloc
             
-            for link in soup.find_all('a', href=True):
-                href = link.get('href')  # type: ignore
+            for link in tree.css('a[href]'):
+                href = link.attributes.get('href')
                 if href:
-                    # Convert relative URLs to absolute
-                    absolute_url = urljoin(base_url, str(href))
+                    # Convert relative URLs to absolute, normalized once per link
+                    absolute_url = _normalize_url(urljoin(base_url, str(href)))
+                    parsed = urlparse(absolute_url)
                     
-                    # Filter out non-HTTP links and external domains
+                    # Filter out non-HTTP links, external domains and non-HTML files
                     if (absolute_url.startswith('http') and 
-                        self._is_same_domain(base_url, absolute_url)):
+                        parsed.netloc == base_domain and
+                        not parsed.path.lower().endswith(NON_HTML_EXTENSIONS)):
                         links.append(absolute_url)
             
             # Remove duplicates while preserving order
@@ -171,14 +236,5 @@ class WebsiteTraverser:
             return unique_links
             
         except Exception as e:
-            logger.debug(f"Error extracting links: {e}")
+            logger.debug("Error extracting links: %s", e)
             return []
-    
-    def _is_same_domain(self, url1: str, url2: str) -> bool:
-        """Check if two URLs belong to the same domain."""
-        try:
-            domain1 = urlparse(url1).netloc
-            domain2 = urlparse(url2).netloc
-            return domain1 == domain2
-        except Exception:
-            return False
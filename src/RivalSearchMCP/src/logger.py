@@ -1,4 +1,7 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 import os
 
@@ -14,7 +17,16 @@ logger.setLevel(getattr(logging, log_level, logging.INFO))
 logger.propagate = False
 
 # Add handler if none exists (to avoid duplicate handlers)
+# Records are queued and written to stderr by a listener thread, so logging
+# never blocks the event loop on terminal I/O. Debug and info calls use
+# %-style arguments so disabled records are never formatted.
 if not logger.handlers:
     handler = logging.StreamHandler(sys.stderr)
     handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-    logger.addHandler(handler)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)  # flush queued records on shutdown
+
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
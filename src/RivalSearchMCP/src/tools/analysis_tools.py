@@ -3,13 +3,29 @@ Analysis tools for FastMCP server.
 Handles content analysis and end-to-end research workflows.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 from fastmcp import FastMCP
 import re
 from collections import Counter
 
 from logger import logger
 
+# Static vocabularies and patterns, built once at import instead of per call
+SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+IMPORTANT_WORDS = ('important', 'key', 'critical', 'essential', 'significant', 'major', 'primary')
+FINDING_WORDS = ('important', 'key', 'critical', 'significant')
+POSITIVE_WORDS = ('good', 'great', 'excellent', 'amazing', 'wonderful', 'positive', 'happy', 'success')
+NEGATIVE_WORDS = ('bad', 'terrible', 'awful', 'negative', 'sad', 'failure', 'problem', 'issue')
+TECHNICAL_PATTERNS = (
+    re.compile(r'\b[A-Z]{2,}\b'),  # Acronyms
+    re.compile(r'\b\w+\.\w+\b'),   # Abbreviations
+    re.compile(r'\b\d+\.\d+\b'),   # Version numbers
+    re.compile(r'\b[A-Z][a-z]+(?:[A-Z][a-z]+)*\b')  # CamelCase
+)
+MONEY_RE = re.compile(r'\$[\d,]+(?:\.\d{2})?')
+PERCENTAGE_RE = re.compile(r'\d+(?:\.\d+)?%')
+DATE_RE = re.compile(r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b')
+
 
 def register_analysis_tools(mcp: FastMCP):
     """Register all analysis-related tools."""
@@ -31,7 +47,7 @@ def register_analysis_tools(mcp: FastMCP):
             summarize: Whether to create a summary
         """
         try:
-            logger.info(f"Analyzing content with type: {analysis_type}")
+            logger.info("Analyzing content with type: %s", analysis_type)
             
             # Basic content analysis
             analysis_result = {
@@ -46,7 +62,7 @@ def register_analysis_tools(mcp: FastMCP):
             # Extract key points if requested
             if extract_key_points:
                 # Real key point extraction using sentence analysis
-                sentences = re.split(r'[.!?]+', content)
+                sentences = SENTENCE_SPLIT_RE.split(content)
                 sentences = [s.strip() for s in sentences if len(s.strip()) > 30]
                 
                 # Score sentences by length and keyword density
@@ -54,9 +70,9 @@ def register_analysis_tools(mcp: FastMCP):
                 for sentence in sentences:
                     score = len(sentence) * 0.3  # Length factor
                     # Add score for important keywords
-                    important_words = ['important', 'key', 'critical', 'essential', 'significant', 'major', 'primary']
-                    for word in important_words:
-                        if word.lower() in sentence.lower():
+                    sentence_lower = sentence.lower()
+                    for word in IMPORTANT_WORDS:
+                        if word in sentence_lower:
                             score += 10
                     scored_sentences.append((sentence, score))
                 
@@ -68,7 +84,7 @@ def register_analysis_tools(mcp: FastMCP):
             # Create summary if requested
             if summarize:
                 # Real summary using extractive summarization
-                sentences = re.split(r'[.!?]+', content)
+                sentences = SENTENCE_SPLIT_RE.split(content)
                 sentences = [s.strip() for s in sentences if len(s.strip()) > 20]
                 
                 if len(sentences) > 3:
@@ -87,12 +103,9 @@ def register_analysis_tools(mcp: FastMCP):
             # Type-specific analysis
             if analysis_type == "sentiment":
                 # Real sentiment analysis using keyword counting
-                positive_words = ['good', 'great', 'excellent', 'amazing', 'wonderful', 'positive', 'happy', 'success']
-                negative_words = ['bad', 'terrible', 'awful', 'negative', 'sad', 'failure', 'problem', 'issue']
-                
                 content_lower = content.lower()
-                positive_count = sum(content_lower.count(word) for word in positive_words)
-                negative_count = sum(content_lower.count(word) for word in negative_words)
+                positive_count = sum(content_lower.count(word) for word in POSITIVE_WORDS)
+                negative_count = sum(content_lower.count(word) for word in NEGATIVE_WORDS)
                 
                 if positive_count > negative_count:
                     sentiment = "positive"
@@ -109,29 +122,17 @@ def register_analysis_tools(mcp: FastMCP):
                 
             elif analysis_type == "technical":
                 # Real technical term extraction
-                technical_patterns = [
-                    r'\b[A-Z]{2,}\b',  # Acronyms
-                    r'\b\w+\.\w+\b',   # Abbreviations
-                    r'\b\d+\.\d+\b',   # Version numbers
-                    r'\b[A-Z][a-z]+(?:[A-Z][a-z]+)*\b'  # CamelCase
-                ]
-                
                 technical_terms = set()
-                for pattern in technical_patterns:
-                    matches = re.findall(pattern, content)
-                    technical_terms.update(matches)
+                for pattern in TECHNICAL_PATTERNS:
+                    technical_terms.update(pattern.findall(content))
                 
                 analysis_result["insights"]["technical_terms"] = list(technical_terms)[:10]
                 
             elif analysis_type == "business":
                 # Real business metrics extraction
-                money_pattern = r'\$[\d,]+(?:\.\d{2})?'
-                percentage_pattern = r'\d+(?:\.\d+)?%'
-                date_pattern = r'\b\d{1,2}[/-]\d{1,2}[/-]\d{2,4}\b'
-                
-                money_matches = re.findall(money_pattern, content)
-                percentage_matches = re.findall(percentage_pattern, content)
-                date_matches = re.findall(date_pattern, content)
+                money_matches = MONEY_RE.findall(content)
+                percentage_matches = PERCENTAGE_RE.findall(content)
+                date_matches = DATE_RE.findall(content)
                 
                 analysis_result["insights"]["business_metrics"] = {
                     "monetary_values": money_matches[:5],
@@ -170,7 +171,7 @@ def register_analysis_tools(mcp: FastMCP):
             include_analysis: Whether to include content analysis
         """
         try:
-            logger.info(f"Starting comprehensive research on: {topic}")
+            logger.info("Starting comprehensive research on: %s", topic)
             
             # Real research workflow implementation
             from core.search import GoogleSearchScraper
@@ -183,6 +184,8 @@ def register_analysis_tools(mcp: FastMCP):
                 "summary": "",
                 "recommendations": []
             }
+            # Findings already collected, so boilerplate repeated across sources is kept once
+            seen_findings: Set[str] = set()
             
             # Step 1: Search for relevant sources
             if not sources:
@@ -206,9 +209,11 @@ def register_analysis_tools(mcp: FastMCP):
                         })
                         
                         # Extract key findings from this source
-                        sentences = re.split(r'[.!?]+', clean_content)
-                        key_sentences = [s.strip() for s in sentences if len(s.strip()) > 50 and any(word in s.lower() for word in ['important', 'key', 'critical', 'significant'])]
-                        research_results["key_findings"].extend(key_sentences[:3])
+                        sentences = SENTENCE_SPLIT_RE.split(clean_content)
+                        key_sentences = [s.strip() for s in sentences if len(s.strip()) > 50 and any(word in s.lower() for word in FINDING_WORDS)]
+                        new_findings = [s for s in dict.fromkeys(key_sentences) if s not in seen_findings][:3]
+                        seen_findings.update(new_findings)
+                        research_results["key_findings"].extend(new_findings)
                         
                 except Exception as e:
                     logger.warning(f"Failed to retrieve content from {source_url}: {e}")
@@ -6,9 +6,9 @@ Handles content retrieval, streaming, batch operations, and image extraction.
 from typing import Union, List, Optional
 from fastmcp import FastMCP
 
-from core.fetch import base_fetch_url, batch_rival_retrieve, stream_fetch, rival_retrieve
+from core.fetch import base_fetch_url, stream_fetch, rival_retrieve
 from core.search import process_images_ocr
-from utils import clean_html_to_markdown
+from utils import clean_html_to_markdown, create_soup
 from logger import logger
 
 
@@ -27,26 +27,19 @@ def register_retrieval_tools(mcp: FastMCP):
         
         Args:
             resource: Single URL, list of URLs, or search query (e.g., "search:python")
-            limit: Maximum number of results for batch operations
+            limit: Maximum search results, and concurrent retrievals for batch operations
             max_length: Maximum content length per result
             extract_images: Whether to extract and process images with OCR
         """
         try:
-            logger.info(f"Retrieving content from: {resource}")
+            logger.info("Retrieving content from: %s", resource)
             
             # Handle list of resources (batch retrieval)
             if isinstance(resource, list):
-                logger.info(f"Batch retrieving from {len(resource)} resources")
-                results = await batch_rival_retrieve(resource, max_concurrent=limit)
-                
-                # Extract content from results
-                content_parts = []
-                for result in results:
-                    if result.get('success') and result.get('content'):
-                        # Clean HTML and format content
-                        content_str = str(result['content']) if result['content'] else ""
-                        clean_content = clean_html_to_markdown(content_str, result.get('url', ''))
-                        content_parts.append(clean_content)
+                logger.info("Batch retrieving from %s resources", len(resource))
+                # rival_retrieve sends each item down its own URL or search path
+                results = await rival_retrieve(resource, limit, max_length, max_workers=limit)
+                content_parts = [str(result['content']) for result in results if result['success']]
                 
                 combined_content = "\n\n---\n\n".join(content_parts)
                 
@@ -80,23 +73,23 @@ def register_retrieval_tools(mcp: FastMCP):
                             "is_search": is_search
                         }
                     
+                    # Parse once; OCR reads the <img> tags before cleaning strips elements
+                    soup = create_soup(str(content))
+                    
+                    # Handle image extraction if requested
+                    image_text = ""
+                    if extract_images:
+                        try:
+                            ocr_results = await process_images_ocr(soup, resource)
+                            if ocr_results:
+                                image_text = ' | '.join(ocr_results)
+                        except Exception as e:
+                            logger.warning(f"Image extraction failed: {e}")
+                    
                     # Clean HTML and format content
-                    content_str = str(content) if content else ""
-                    clean_content = clean_html_to_markdown(content_str, resource)
-                
-                # Handle image extraction if requested
-                if extract_images and not is_search:
-                    try:
-                        from bs4 import BeautifulSoup
-                        content_for_soup = content if content else ""
-                        soup = BeautifulSoup(str(content_for_soup), 'html.parser')
-                        ocr_results = await process_images_ocr(soup, resource)
-                        
-                        if ocr_results:
-                            image_text = ' | '.join(ocr_results)
-                            clean_content += f"\n\n**Image Text Extracted:** {image_text}"
-                    except Exception as e:
-                        logger.warning(f"Image extraction failed: {e}")
+                    clean_content = clean_html_to_markdown(soup, resource)
+                    if image_text:
+                        clean_content += f"\n\n**Image Text Extracted:** {image_text}"
                 
                 return {
                     "success": True,
@@ -119,7 +112,7 @@ def register_retrieval_tools(mcp: FastMCP):
     async def stream_content(url: str) -> dict:
         """Retrieve streaming content from WebSocket URLs."""
         try:
-            logger.info(f"Retrieving stream from: {url}")
+            logger.info("Retrieving stream from: %s", url)
             content = await stream_fetch(url)
             
             # Clean and format streaming content
@@ -49,8 +49,8 @@ def register_search_tools(mcp: FastMCP):
             use_multi_engine: Use multi-engine search as fallback if direct scraping fails
         """
         try:
-            logger.info(f"🔍 Performing Google Search for: {query}")
-            logger.info(f"📊 Target results: {num_results}")
+            logger.info("🔍 Performing Google Search for: %s", query)
+            logger.info("📊 Target results: %s", num_results)
             
             # First try direct Google Search scraping
             try:
@@ -112,7 +112,7 @@ def register_search_tools(mcp: FastMCP):
             
             # Fallback to multi-engine search if direct scraping failed or no results
             if use_multi_engine or not results:
-                logger.info(f"🔄 Falling back to multi-engine search for: {query}")
+                logger.info("🔄 Falling back to multi-engine search for: %s", query)
                 search_resource = f"search:{query}"
                 content = await rival_retrieve(search_resource, num_results)
                 
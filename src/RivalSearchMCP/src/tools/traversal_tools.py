@@ -3,7 +3,7 @@ Traversal tools for FastMCP server.
 Handles website research, documentation exploration, and website mapping.
 """
 
-from typing import Literal
+from typing import List, Literal
 from fastmcp import FastMCP
 
 from core.traverse import research_topic, explore_documentation, map_website_structure
@@ -11,6 +11,40 @@ from utils import clean_html_to_markdown
 from logger import logger
 
 
+def _build_traversal_result(result: List[dict], url: str, mode: str) -> dict:
+    """Convert traversed pages into the tool response with clean content."""
+    pages = [
+        {
+            'url': page_dict.get('url', ''),
+            'title': page_dict.get('title', ''),
+            'content': clean_html_to_markdown(str(page_dict.get('content', '')), page_dict.get('url', '')),
+            'depth': page_dict.get('depth', 0)
+        }
+        for page_dict in result
+    ]
+    
+    return {
+        "success": True,
+        "pages": pages,
+        "summary": f"Successfully traversed {len(pages)} pages in {mode} mode",
+        "total_pages": len(pages),
+        "source": url,
+        "mode": mode
+    }
+
+
+def _traversal_error(url: str, mode: str, summary: str) -> dict:
+    """Build a failed traversal response."""
+    return {
+        "success": False,
+        "pages": [],
+        "summary": summary,
+        "total_pages": 0,
+        "source": url,
+        "mode": mode
+    }
+
+
 def register_traversal_tools(mcp: FastMCP):
     """Register all traversal-related tools."""
     
@@ -31,7 +65,7 @@ def register_traversal_tools(mcp: FastMCP):
             max_depth: Maximum depth for mapping mode
         """
         try:
-            logger.info(f"Traversing website: {url} in {mode} mode")
+            logger.info("Traversing website: %s in %s mode", url, mode)
             
             if mode == "research":
                 result = await research_topic(url, max_pages=max_pages)
@@ -40,44 +74,10 @@ def register_traversal_tools(mcp: FastMCP):
             elif mode == "map":
                 result = await map_website_structure(url, max_pages=max_pages)
             else:
-                return {
-                    "success": False,
-                    "pages": [],
-                    "summary": f"Invalid mode: {mode}. Use 'research', 'docs', or 'map'",
-                    "total_pages": 0,
-                    "source": url
-                }
-            
-            # Convert result to simple dict format with clean content
-            pages = []
-            for page_dict in result:
-                # Clean HTML content
-                raw_content = page_dict.get('content', '')
-                clean_content = clean_html_to_markdown(str(raw_content), page_dict.get('url', ''))
-                
-                pages.append({
-                    'url': page_dict.get('url', ''),
-                    'title': page_dict.get('title', ''),
-                    'content': clean_content,
-                    'depth': page_dict.get('depth', 0)
-                })
+                return _traversal_error(url, mode, f"Invalid mode: {mode}. Use 'research', 'docs', or 'map'")
             
-            return {
-                "success": True,
-                "pages": pages,
-                "summary": f"Successfully traversed {len(result)} pages in {mode} mode",
-                "total_pages": len(result),
-                "source": url,
-                "mode": mode
-            }
+            return _build_traversal_result(result, url, mode)
             
         except Exception as e:
             logger.error(f"Website traversal failed for {url}: {e}")
-            return {
-                "success": False,
-                "pages": [],
-                "summary": f"Error: {str(e)}",
-                "total_pages": 0,
-                "source": url,
-                "mode": mode
-            }
+            return _traversal_error(url, mode, f"Error: {str(e)}")
@@ -9,22 +9,40 @@ from bs4 import BeautifulSoup, Tag
 from bs4.element import NavigableString, PageElement
 from urllib.parse import urljoin, urlparse
 
+# Patterns compiled once; they run for every element and line of every page
+AD_CLASS_RE = re.compile(r'(ad|ads|advertisement|banner|tracking|analytics|cookie|popup|modal|overlay)', re.I)
+AD_ID_RE = re.compile(r'(ad|ads|banner|tracking|analytics|cookie|popup|modal|overlay)', re.I)
+WHITESPACE_RE = re.compile(r'\s+')
+EMPTY_MARKUP_RES = (
+    re.compile(r'^\s*[-*+]\s*$'),  # Empty list items
+    re.compile(r'^\s*>\s*$'),      # Empty blockquotes
+    re.compile(r'^\s*#+\s*$'),     # Empty headers
+    re.compile(r'\*\*\s+\*\*'),   # Empty bold
+    re.compile(r'\*\s+\*'),       # Empty italic
+    re.compile(r'`\s+`'),         # Empty code
+)
+REPEATED_PUNCTUATION_RE = re.compile(r'[.!?]{3,}')
+REPEATED_RULE_RE = re.compile(r'[-_]{3,}')
 
-def clean_html_to_markdown(html_content: str, base_url: str = "") -> str:
+
+def clean_html_to_markdown(html_content: Union[str, BeautifulSoup], base_url: str = "") -> str:
     """
     Convert HTML content to clean markdown format.
     
     Args:
-        html_content: Raw HTML content
+        html_content: Raw HTML content, or an already parsed document to reuse
+            (unwanted elements are removed from it in place)
         base_url: Base URL for resolving relative links
         
     Returns:
         Clean markdown formatted content
     """
-    if not html_content:
+    if isinstance(html_content, BeautifulSoup):
+        soup = html_content
+    elif not html_content:
         return ""
-    
-    soup = BeautifulSoup(html_content, 'html.parser')
+    else:
+        soup = BeautifulSoup(html_content, 'lxml')
     
     # Remove unwanted elements
     _remove_unwanted_elements(soup)
@@ -47,11 +65,11 @@ def _remove_unwanted_elements(soup: BeautifulSoup) -> None:
         element.decompose()
     
     # Remove common ad and tracking elements
-    for element in soup.find_all(class_=re.compile(r'(ad|ads|advertisement|banner|tracking|analytics|cookie|popup|modal|overlay)', re.I)):
+    for element in soup.find_all(class_=AD_CLASS_RE):
         element.decompose()
     
     # Remove elements with common ad IDs
-    for element in soup.find_all(id=re.compile(r'(ad|ads|banner|tracking|analytics|cookie|popup|modal|overlay)', re.I)):
+    for element in soup.find_all(id=AD_ID_RE):
         element.decompose()
 
 
@@ -211,21 +229,15 @@ def _clean_line(line: str) -> str:
         return ""
     
     # Remove excessive whitespace
-    line = re.sub(r'\s+', ' ', line.strip())
-    
-    # Remove common unwanted patterns
-    line = re.sub(r'^\s*[-*+]\s*$', '', line)  # Empty list items
-    line = re.sub(r'^\s*>\s*$', '', line)      # Empty blockquotes
-    line = re.sub(r'^\s*#+\s*$', '', line)     # Empty headers
+    line = WHITESPACE_RE.sub(' ', line.strip())
     
-    # Clean up markdown formatting
-    line = re.sub(r'\*\*\s+\*\*', '', line)    # Empty bold
-    line = re.sub(r'\*\s+\*', '', line)        # Empty italic
-    line = re.sub(r'`\s+`', '', line)          # Empty code
+    # Remove empty list items, blockquotes, headers and markdown formatting
+    for pattern in EMPTY_MARKUP_RES:
+        line = pattern.sub('', line)
     
     # Remove excessive punctuation
-    line = re.sub(r'[.!?]{3,}', '...', line)
-    line = re.sub(r'[-_]{3,}', '---', line)
+    line = REPEATED_PUNCTUATION_RE.sub('...', line)
+    line = REPEATED_RULE_RE.sub('---', line)
     
     return line.strip()
 
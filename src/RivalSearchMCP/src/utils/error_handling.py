@@ -28,10 +28,10 @@ def log_operation(operation_name: str):
     """Decorator for consistent operation logging."""
     def decorator(func):
         async def wrapper(*args, **kwargs):
-            logger.info(f"Starting {operation_name}...")
+            logger.info("Starting %s...", operation_name)
             try:
                 result = await func(*args, **kwargs)
-                logger.info(f"✅ {operation_name} completed successfully")
+                logger.info("✅ %s completed successfully", operation_name)
                 return result
             except Exception as e:
                 logger.error(f"❌ {operation_name} failed: {e}")
@@ -8,8 +8,8 @@ from bs4 import BeautifulSoup
 
 
 def create_soup(html_content: str) -> BeautifulSoup:
-    """Create a BeautifulSoup object with consistent parser."""
-    return BeautifulSoup(html_content, 'html.parser')
+    """Create a BeautifulSoup object with consistent parser (C-backed lxml)."""
+    return BeautifulSoup(html_content, 'lxml')
 
 
 def extract_text_safe(element) -> str:
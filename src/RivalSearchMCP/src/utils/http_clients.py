@@ -10,6 +10,10 @@ from typing import Optional
 from .user_agents import get_random_user_agent
 
 
+# Shared pool size: every fetch, search and bypass request goes through one client
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 30
+
 # Global connection pools
 _http_client: Optional[httpx.AsyncClient] = None
 _cloudscraper_session: Optional[cloudscraper.CloudScraper] = None
@@ -22,6 +26,16 @@ async def get_http_client() -> httpx.AsyncClient:
         _http_client = httpx.AsyncClient(
             timeout=30.0,
             follow_redirects=True,
+            # Retry failed connects, e.g. transient DNS resolution errors.
+            # A custom transport owns the pool, so HTTP/2 and limits are set here.
+            transport=httpx.AsyncHTTPTransport(
+                retries=1,
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+                )
+            ),
             headers={'User-Agent': get_random_user_agent()}
         )
     return _http_client
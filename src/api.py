@@ -8,16 +8,17 @@ Provides REST API endpoints for:
 """
 
 import asyncio
-import json
 import logging
 import os
+from contextlib import asynccontextmanager
 from typing import List, Optional
 from pathlib import Path
 
+import orjson
 import uvicorn
 from fastapi import FastAPI, HTTPException, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 from dotenv import load_dotenv
@@ -33,11 +34,28 @@ from .core.services.rag_service import RAGService, RAGDependencies
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open database connections before the first request and close them on shutdown."""
+    if os.getenv('DATABASE_URL'):
+        try:
+            memory_service = await get_memory_service()
+            await memory_service.warmup()
+        except Exception as e:
+            logger.warning(f"Memory service warmup failed: {e}")
+    
+    yield
+    
+    if _memory_service is not None:
+        await _memory_service.close()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="RivalSearch Agent API",
     description="API for RivalSearch Agent with RAG capabilities",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -79,7 +97,9 @@ async def get_agent() -> RivalSearchAgent:
     global _agent
     if _agent is None:
         config = AgentConfig()
-        _agent = RivalSearchAgent(config)
+        # The agent shares the API's memory service, so the process holds one pool
+        memory_service = await get_memory_service() if os.getenv('DATABASE_URL') else None
+        _agent = RivalSearchAgent(config, memory_service=memory_service)
         await _agent.initialize()
         logger.info("Agent initialized successfully")
     return _agent
@@ -186,7 +206,7 @@ async def chat_stream(request: ChatRequest):
                     thread_id=request.thread_id
                 ):
                     full_response += text_chunk
-                    yield f"data: {json.dumps({'text': text_chunk})}\n\n"
+                    yield f"data: {orjson.dumps({'text': text_chunk}).decode()}\n\n"
                 
                 # Store assistant response in memory
                 await memory_service.add_message(request.session_id, 'assistant', full_response)
@@ -9,7 +9,7 @@ import asyncio
 import logging
 import sys
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set
 from datetime import datetime, timezone
 
 from pydantic import BaseModel, Field
@@ -48,12 +48,21 @@ class RivalSearchState(BaseModel):
 class RivalSearchAgent:
     """RivalSearch Agent using Pydantic AI with MCP integration."""
     
-    def __init__(self, config: AgentConfig):
-        """Initialize the RivalSearch Agent with configuration."""
+    def __init__(self, config: AgentConfig, memory_service=None):
+        """Initialize the RivalSearch Agent with configuration.
+        
+        Args:
+            config: Agent configuration
+            memory_service: Optional memory service to share with the caller;
+                one is created from ``config.database_url`` when omitted
+        """
         self.config = config
         self._agent: Optional[Agent] = None
         self._mcp_server: Optional[MCPServerStdio] = None
         self._connected = False
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._pending_summaries: Set[str] = set()
+        self._memory_service = memory_service
         
         logger.info(f"Initializing RivalSearch Agent with MCP server: {config.mcp_server_path}")
     
@@ -155,18 +164,17 @@ class RivalSearchAgent:
             # Ensure MCP server is connected
             await self._ensure_connection()
             
-            # Initialize memory service if database URL is available
-            memory_service = None
-            if hasattr(self.config, 'database_url') and self.config.database_url:
-                from .services.memory_service import CompleteMemoryService
-                memory_service = CompleteMemoryService(self.config.database_url)
-                
+            # Use the memory service if database URL is available
+            memory_service = self._get_memory_service()
+            if memory_service:
                 # Create session if it doesn't exist
                 if session_id:
                     await memory_service.create_session(session_id)
                 
-                # Get complete conversation history
-                message_history = await memory_service.get_conversation_as_pydantic_messages(session_id)
+                # Get recent conversation history plus summary
+                message_history = await memory_service.get_conversation_as_pydantic_messages(
+                    session_id, window=self.config.conversation_window
+                )
                 
                 # Add user message to history
                 await memory_service.add_message(session_id, 'user', user_input)
@@ -186,6 +194,7 @@ class RivalSearchAgent:
             # Store assistant response in memory
             if memory_service and session_id:
                 await memory_service.add_message(session_id, 'assistant', result.output)
+                self._schedule_summary_refresh(memory_service, session_id)
             
             return result.output
                 
@@ -202,18 +211,17 @@ class RivalSearchAgent:
             # Ensure MCP server is connected
             await self._ensure_connection()
             
-            # Initialize memory service if database URL is available
-            memory_service = None
-            if hasattr(self.config, 'database_url') and self.config.database_url:
-                from .services.memory_service import CompleteMemoryService
-                memory_service = CompleteMemoryService(self.config.database_url)
-                
+            # Use the memory service if database URL is available
+            memory_service = self._get_memory_service()
+            if memory_service:
                 # Create session if it doesn't exist
                 if session_id:
                     await memory_service.create_session(session_id)
                 
-                # Get complete conversation history FOR THIS SESSION ONLY
-                message_history = await memory_service.get_conversation_as_pydantic_messages(session_id)
+                # Get recent conversation history plus summary FOR THIS SESSION ONLY
+                message_history = await memory_service.get_conversation_as_pydantic_messages(
+                    session_id, window=self.config.conversation_window
+                )
                 
                 # Add user message to history
                 await memory_service.add_message(session_id, 'user', user_input)
@@ -237,11 +245,45 @@ class RivalSearchAgent:
             # Store assistant response in memory
             if memory_service and session_id:
                 await memory_service.add_message(session_id, 'assistant', full_response)
+                self._schedule_summary_refresh(memory_service, session_id)
                 
         except Exception as e:
             logger.error(f"Error running agent stream: {e}")
             raise
     
+    def _get_memory_service(self):
+        """Get the shared memory service, if a database is configured."""
+        if self._memory_service is None and getattr(self.config, 'database_url', None):
+            from .services.memory_service import CompleteMemoryService
+            self._memory_service = CompleteMemoryService(self.config.database_url)
+        return self._memory_service
+    
+    def _schedule_summary_refresh(self, memory_service, session_id: str) -> None:
+        """Refresh the session's rolling summary in the background."""
+        if not self.config.conversation_window:
+            return
+        
+        # Don't stack refreshes for a session; the next message schedules another
+        if session_id in self._pending_summaries:
+            return
+        
+        task = asyncio.create_task(
+            memory_service.refresh_summary(session_id, self.config.conversation_window)
+        )
+        self._background_tasks.add(task)
+        self._pending_summaries.add(session_id)
+        task.add_done_callback(lambda done: self._finish_summary_refresh(session_id, done))
+    
+    def _finish_summary_refresh(self, session_id: str, task: asyncio.Task) -> None:
+        """Forget a finished summary refresh and log its failure, if any."""
+        self._background_tasks.discard(task)
+        self._pending_summaries.discard(session_id)
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            logger.error(f"Summary refresh failed for session {session_id}: {error}")
+    
     async def disconnect(self):
         """Disconnect from the MCP server."""
         if self._mcp_server:
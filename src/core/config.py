@@ -188,6 +188,12 @@ You are the RivalSearch Agent, a specialized research and analysis assistant wit
         description="Database URL for conversation memory storage"
     )
     
+    # Conversation memory window
+    conversation_window: Optional[int] = Field(
+        default=20,
+        description="Number of most recent messages sent to the model; older messages are summarized (None sends the complete history)"
+    )
+    
     # Performance Configuration
     max_concurrent_requests: int = Field(
         default=5,
@@ -5,10 +5,11 @@ This service ensures the agent NEVER forgets any part of the conversation.
 Every message is stored permanently and can be recalled in full.
 """
 
+import asyncio
 import json
 import logging
 import uuid
-from typing import List, Dict, Any, Optional, Tuple
+from typing import AsyncIterator, Callable, List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
 
 import asyncpg
@@ -16,24 +17,93 @@ from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, User
 
 logger = logging.getLogger(__name__)
 
+# Batches at least this large are written with COPY instead of executemany
+COPY_THRESHOLD = 500
+
+# Rolling summary of messages outside the history window
+SUMMARY_REFRESH_THRESHOLD = 10
+SUMMARY_LINE_CHARS = 200
+SUMMARY_MAX_CHARS = 4000
+
+# Stored role -> Pydantic AI message constructor
+MESSAGE_BUILDERS: Dict[str, Callable[[str], ModelMessage]] = {
+    'user': lambda content: ModelRequest(parts=[UserPromptPart(content=content)]),
+    'assistant': lambda content: ModelResponse(parts=[TextPart(content=content)]),
+    'system': lambda content: ModelRequest(parts=[SystemPromptPart(content=content)]),
+}
+
+def _encode_jsonb(value: Any) -> bytes:
+    """Encode a value in the JSONB binary format (version byte + JSON text)."""
+    return b'\x01' + json.dumps(value).encode('utf-8')
+
+def _decode_jsonb(data: bytes) -> Any:
+    """Decode a value from the JSONB binary format."""
+    return json.loads(data[1:])
+
+def _trim_summary(lines: List[str]) -> str:
+    """Join digest lines, dropping whole lines from the front until it fits."""
+    size = sum(len(line) + 1 for line in lines) - 1
+    start = 0
+    while size > SUMMARY_MAX_CHARS and start < len(lines) - 1:
+        size -= len(lines[start]) + 1
+        start += 1
+    return '\n'.join(lines[start:])
+
 class CompleteMemoryService:
     """Service for complete conversation memory - NO FORGETTING."""
     
-    def __init__(self, database_url: str):
+    def __init__(
+        self, 
+        database_url: str, 
+        min_pool_size: int = 10, 
+        max_pool_size: int = 50,
+        max_inactive_connection_lifetime: float = 300.0
+    ):
         self.database_url = database_url
+        self.min_pool_size = min_pool_size
+        self.max_pool_size = max_pool_size
+        self.max_inactive_connection_lifetime = max_inactive_connection_lifetime
         self._pool = None
+        self._pool_lock = asyncio.Lock()
     
     async def _get_pool(self) -> asyncpg.Pool:
         """Get or create database connection pool."""
         if self._pool is None:
-            self._pool = await asyncpg.create_pool(
-                self.database_url,
-                min_size=5,
-                max_size=20,
-                command_timeout=60
-            )
+            # Concurrent cold-start callers must not each create their own pool
+            async with self._pool_lock:
+                if self._pool is None:
+                    self._pool = await asyncpg.create_pool(
+                        self.database_url,
+                        min_size=self.min_pool_size,
+                        max_size=self.max_pool_size,
+                        max_inactive_connection_lifetime=self.max_inactive_connection_lifetime,
+                        statement_cache_size=2048,
+                        max_cached_statement_lifetime=0,
+                        command_timeout=60,
+                        init=self._init_connection
+                    )
         return self._pool
     
+    async def warmup(self) -> None:
+        """Create the pool ahead of the first request.
+        
+        ``create_pool`` opens ``min_pool_size`` connections and runs their init
+        hook, so the first requests do not pay the connection handshake cost.
+        """
+        await self._get_pool()
+        logger.info(f"Opened {self.min_pool_size} database connections")
+    
+    @staticmethod
+    async def _init_connection(conn: asyncpg.Connection) -> None:
+        """Encode and decode JSONB columns as Python objects in the driver."""
+        await conn.set_type_codec(
+            'jsonb',
+            encoder=_encode_jsonb,
+            decoder=_decode_jsonb,
+            schema='pg_catalog',
+            format='binary'
+        )
+    
     async def create_session(self, session_id: Optional[str] = None, metadata: Dict[str, Any] = None) -> str:
         """Create a new conversation session."""
         if session_id is None:
@@ -45,7 +115,7 @@ class CompleteMemoryService:
                 INSERT INTO conversation_sessions (session_id, metadata)
                 VALUES ($1, $2)
                 ON CONFLICT (session_id) DO NOTHING
-            """, session_id, json.dumps(metadata or {}))
+            """, session_id, metadata or {})
         
         logger.info(f"Created conversation session: {session_id}")
         return session_id
@@ -59,72 +129,222 @@ class CompleteMemoryService:
         token_count: int = 0
     ) -> int:
         """Add a message to the conversation history - NEVER DELETED."""
+        sequence_numbers = await self.add_messages(session_id, [(role, content, metadata, token_count)])
+        return sequence_numbers[0]
+    
+    async def add_messages(
+        self, 
+        session_id: str, 
+        messages: List[Tuple[str, str, Optional[Dict[str, Any]], int]]
+    ) -> List[int]:
+        """Add several messages to the conversation history in one round trip.
+        
+        Args:
+            session_id: Session the messages belong to
+            messages: ``(role, content, metadata, token_count)`` tuples in order
+            
+        Returns:
+            Sequence numbers assigned to the messages, in the same order
+        """
+        if not messages:
+            return []
+        
         pool = await self._get_pool()
         async with pool.acquire() as conn:
-            # Get next sequence number
-            result = await conn.fetchval("""
-                SELECT COALESCE(MAX(sequence_number), 0) + 1
-                FROM conversation_messages 
-                WHERE session_id = $1
-            """, session_id)
-            
-            sequence_number = result or 1
+            async with conn.transaction():
+                # Lock the session row so concurrent writers cannot allocate
+                # the same sequence numbers.
+                await conn.execute("""
+                    SELECT 1 FROM conversation_sessions
+                    WHERE session_id = $1
+                    FOR UPDATE
+                """, session_id)
+                
+                last_sequence = await conn.fetchval("""
+                    SELECT COALESCE(MAX(sequence_number), 0)
+                    FROM conversation_messages 
+                    WHERE session_id = $1
+                """, session_id)
+                
+                records = [
+                    (session_id, role, content, metadata or {}, last_sequence + offset, token_count)
+                    for offset, (role, content, metadata, token_count) in enumerate(messages, 1)
+                ]
+                
+                if len(records) >= COPY_THRESHOLD:
+                    await conn.copy_records_to_table(
+                        'conversation_messages',
+                        records=records,
+                        columns=['session_id', 'role', 'content', 'metadata', 'sequence_number', 'token_count']
+                    )
+                else:
+                    await conn.executemany("""
+                        INSERT INTO conversation_messages 
+                        (session_id, role, content, metadata, sequence_number, token_count)
+                        VALUES ($1, $2, $3, $4, $5, $6)
+                    """, records)
             
-            # Insert message
-            await conn.execute("""
-                INSERT INTO conversation_messages 
-                (session_id, role, content, metadata, sequence_number, token_count)
-                VALUES ($1, $2, $3, $4, $5, $6)
-            """, session_id, role, content, json.dumps(metadata or {}), sequence_number, token_count)
-            
-            logger.info(f"Added message {sequence_number} to session {session_id}")
-            return sequence_number
+            sequence_numbers = [record[4] for record in records]
+            logger.info(f"Added messages {sequence_numbers[0]}-{sequence_numbers[-1]} to session {session_id}")
+            return sequence_numbers
+    
+    async def iter_complete_conversation(
+        self, 
+        session_id: str, 
+        prefetch: int = 256
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream the COMPLETE conversation history - NO TRUNCATION.
+        
+        Rows are read through a server-side cursor, so only ``prefetch`` rows
+        are held in memory at a time.
+        """
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                async for row in conn.cursor("""
+                    SELECT role, content, timestamp, sequence_number, metadata
+                    FROM conversation_messages
+                    WHERE session_id = $1
+                    ORDER BY sequence_number ASC
+                """, session_id, prefetch=prefetch):
+                    yield {
+                        'role': row['role'],
+                        'content': row['content'],
+                        'timestamp': row['timestamp'],
+                        'sequence_number': row['sequence_number'],
+                        'metadata': row['metadata']
+                    }
     
     async def get_complete_conversation(self, session_id: str) -> List[Dict[str, Any]]:
         """Get the COMPLETE conversation history - NO TRUNCATION."""
+        messages = [message async for message in self.iter_complete_conversation(session_id)]
+        
+        logger.info(f"Retrieved {len(messages)} messages from session {session_id}")
+        return messages
+    
+    async def get_conversation_as_pydantic_messages(
+        self, 
+        session_id: str, 
+        window: Optional[int] = None, 
+        include_summary: bool = True
+    ) -> List[ModelMessage]:
+        """Get conversation as Pydantic AI ModelMessage objects.
+        
+        Args:
+            session_id: Session identifier
+            window: If set, only the most recent ``window`` messages are
+                returned. Older messages stay in the database.
+            include_summary: With a window, prepend the session's rolling
+                summary of the earlier messages (see ``refresh_summary``)
+        
+        Returns:
+            List of ModelMessage objects in conversation order
+        """
         pool = await self._get_pool()
         async with pool.acquire() as conn:
+            if window is None:
+                async with conn.transaction():
+                    return [
+                        MESSAGE_BUILDERS[row['role']](row['content'])
+                        async for row in conn.cursor("""
+                            SELECT role, content
+                            FROM conversation_messages
+                            WHERE session_id = $1
+                            ORDER BY sequence_number ASC
+                        """, session_id, prefetch=256)
+                        if row['role'] in MESSAGE_BUILDERS
+                    ]
+            
             rows = await conn.fetch("""
-                SELECT role, content, timestamp, sequence_number, metadata
+                SELECT role, content
                 FROM conversation_messages
                 WHERE session_id = $1
-                ORDER BY sequence_number ASC
-            """, session_id)
-            
-            messages = []
-            for row in rows:
-                messages.append({
-                    'role': row['role'],
-                    'content': row['content'],
-                    'timestamp': row['timestamp'],
-                    'sequence_number': row['sequence_number'],
-                    'metadata': row['metadata']
-                })
+                ORDER BY sequence_number DESC
+                LIMIT $2
+            """, session_id, window)
             
-            logger.info(f"Retrieved {len(messages)} messages from session {session_id}")
-            return messages
-    
-    async def get_conversation_as_pydantic_messages(self, session_id: str) -> List[ModelMessage]:
-        """Get complete conversation as Pydantic AI ModelMessage objects."""
-        messages_data = await self.get_complete_conversation(session_id)
+            summary = None
+            if include_summary:
+                summary = await conn.fetchval("""
+                    SELECT metadata->>'summary'
+                    FROM conversation_sessions
+                    WHERE session_id = $1
+                """, session_id)
+        
         pydantic_messages = []
+        if summary:
+            pydantic_messages.append(
+                ModelRequest(parts=[SystemPromptPart(content=f"Summary of the earlier conversation:\n{summary}")])
+            )
         
-        for msg_data in messages_data:
-            if msg_data['role'] == 'user':
-                pydantic_messages.append(
-                    ModelRequest(parts=[UserPromptPart(content=msg_data['content'])])
-                )
-            elif msg_data['role'] == 'assistant':
-                pydantic_messages.append(
-                    ModelResponse(parts=[TextPart(content=msg_data['content'])])
-                )
-            elif msg_data['role'] == 'system':
-                pydantic_messages.append(
-                    ModelRequest(parts=[SystemPromptPart(content=msg_data['content'])])
-                )
+        pydantic_messages.extend(
+            MESSAGE_BUILDERS[row['role']](row['content'])
+            for row in reversed(rows)
+            if row['role'] in MESSAGE_BUILDERS
+        )
         
         return pydantic_messages
     
+    async def refresh_summary(self, session_id: str, window: int) -> Optional[str]:
+        """Fold messages that have left the window into the session summary.
+        
+        The summary is an extractive digest (role plus the start of each
+        message) kept in ``conversation_sessions.metadata``. It is only
+        rebuilt once at least ``SUMMARY_REFRESH_THRESHOLD`` messages have
+        left the window since the last refresh. No messages are deleted.
+        
+        Args:
+            session_id: Session identifier
+            window: Number of recent messages sent verbatim to the model
+            
+        Returns:
+            The updated summary, or None if no refresh was needed
+        """
+        pool = await self._get_pool()
+        async with pool.acquire() as conn:
+            state = await conn.fetchrow("""
+                SELECT
+                    cs.metadata->>'summary' AS summary,
+                    COALESCE((cs.metadata->>'summary_through')::int, 0) AS summary_through,
+                    (SELECT COALESCE(MAX(sequence_number), 0)
+                     FROM conversation_messages
+                     WHERE session_id = $1) AS last_sequence
+                FROM conversation_sessions cs
+                WHERE cs.session_id = $1
+            """, session_id)
+            
+            if state is None:
+                return None
+            
+            summarize_through = state['last_sequence'] - window
+            if summarize_through - state['summary_through'] < SUMMARY_REFRESH_THRESHOLD:
+                return None
+            
+            rows = await conn.fetch("""
+                SELECT role, content
+                FROM conversation_messages
+                WHERE session_id = $1 AND sequence_number > $2 AND sequence_number <= $3
+                ORDER BY sequence_number ASC
+            """, session_id, state['summary_through'], summarize_through)
+            
+            lines = state['summary'].split('\n') if state['summary'] else []
+            for row in rows:
+                content = ' '.join(row['content'].split())
+                if len(content) > SUMMARY_LINE_CHARS:
+                    content = content[:SUMMARY_LINE_CHARS] + '...'
+                lines.append(f"{row['role']}: {content}")
+            
+            summary = _trim_summary(lines)
+            
+            await conn.execute("""
+                UPDATE conversation_sessions
+                SET metadata = COALESCE(metadata, '{}'::jsonb) || $2::jsonb
+                WHERE session_id = $1
+            """, session_id, {'summary': summary, 'summary_through': summarize_through})
+            
+            logger.info(f"Refreshed summary for session {session_id} through message {summarize_through}")
+            return summary
+    
     async def get_session_info(self, session_id: str) -> Dict[str, Any]:
         """Get session metadata and statistics."""
         pool = await self._get_pool()
@@ -182,23 +402,73 @@ class CompleteMemoryService:
                 logger.warning(f"DELETED session {session_id} and all its messages")
             return deleted
     
-    async def search_conversations(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Search through conversation content."""
+    async def search_conversations(
+        self, 
+        query: str, 
+        limit: int = 10, 
+        substring: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Search through conversation content.
+        
+        By default uses PostgreSQL full-text search (backed by the
+        ``idx_conversation_messages_content_fts`` GIN index) and returns the
+        best-ranked matching message per session. With ``substring=True`` the
+        search keeps ``ILIKE '%query%'`` semantics (e.g. partial URLs), which is
+        served by the ``idx_conversation_messages_content_trgm`` trigram index.
+        Single-character full-text queries, which would produce an empty
+        tsquery, fall back to a substring match.
+        """
+        query = query.strip()
+        if not query:
+            return []
+        
+        # The trigram index cannot serve substring queries shorter than 3
+        # characters; reject them instead of forcing a sequential scan.
+        if substring and len(query) < 3:
+            return []
+        
         pool = await self._get_pool()
         async with pool.acquire() as conn:
-            rows = await conn.fetch("""
-                SELECT DISTINCT 
-                    cs.session_id,
-                    cs.created_at,
-                    cs.message_count,
-                    cm.content as matching_content,
-                    cm.sequence_number
-                FROM conversation_sessions cs
-                JOIN conversation_messages cm ON cs.session_id = cm.session_id
-                WHERE cm.content ILIKE $1
-                ORDER BY cs.updated_at DESC
-                LIMIT $2
-            """, f'%{query}%', limit)
+            if substring or len(query) < 2:
+                rows = await conn.fetch("""
+                    SELECT session_id, created_at, message_count, matching_content, sequence_number
+                    FROM (
+                        SELECT DISTINCT ON (cs.session_id)
+                            cs.session_id,
+                            cs.created_at,
+                            cs.updated_at,
+                            cs.message_count,
+                            cm.content as matching_content,
+                            cm.sequence_number
+                        FROM conversation_messages cm
+                        JOIN conversation_sessions cs ON cs.session_id = cm.session_id
+                        WHERE cm.content ILIKE $1
+                        ORDER BY cs.session_id, cm.sequence_number DESC
+                    ) matches
+                    ORDER BY updated_at DESC
+                    LIMIT $2
+                """, f'%{query}%', limit)
+            else:
+                rows = await conn.fetch("""
+                    SELECT session_id, created_at, message_count, matching_content, sequence_number
+                    FROM (
+                        SELECT DISTINCT ON (cs.session_id)
+                            cs.session_id,
+                            cs.created_at,
+                            cs.updated_at,
+                            cs.message_count,
+                            cm.content as matching_content,
+                            cm.sequence_number,
+                            ts_rank_cd(to_tsvector('english', cm.content), q.query) as rank
+                        FROM conversation_messages cm
+                        JOIN conversation_sessions cs ON cs.session_id = cm.session_id
+                        CROSS JOIN plainto_tsquery('english', $1) AS q(query)
+                        WHERE to_tsvector('english', cm.content) @@ q.query
+                        ORDER BY cs.session_id, rank DESC
+                    ) matches
+                    ORDER BY rank DESC, updated_at DESC
+                    LIMIT $2
+                """, query, limit)
             
             results = []
             for row in rows:
@@ -16,6 +16,29 @@ from .document_service import DocumentProcessor
 
 logger = logging.getLogger(__name__)
 
+RAG_RESULT_TEMPLATE = (
+    "Document {index}: {file_name} (Chunk {chunk_index})\n"
+    "Relevance Score: {score:.3f}\n"
+    "Content:\n{content}\n"
+)
+
+def _format_rag_results(results: List[Dict[str, Any]], query: Optional[str] = None) -> str:
+    """Format RAG search results for the model."""
+    header = f"Found {len(results)} relevant document chunks"
+    if query is not None:
+        header += f" for query '{query}'"
+    
+    return header + ":\n\n" + "\n---\n".join(
+        RAG_RESULT_TEMPLATE.format(
+            index=i,
+            file_name=result['file_name'],
+            chunk_index=result['chunk_index'],
+            score=1 - result['distance'],
+            content=result['content']
+        )
+        for i, result in enumerate(results, 1)
+    )
+
 @dataclass
 class RAGDependencies:
     """Dependencies for RAG functionality."""
@@ -155,16 +178,7 @@ def create_rag_tools(deps: RAGDependencies):
             if not results:
                 return "No relevant documents found for your query."
             
-            # Format results for the model
-            formatted_results = []
-            for i, result in enumerate(results, 1):
-                formatted_results.append(
-                    f"Document {i}: {result['file_name']} (Chunk {result['chunk_index']})\n"
-                    f"Relevance Score: {1 - result['distance']:.3f}\n"
-                    f"Content:\n{result['content']}\n"
-                )
-            
-            return f"Found {len(results)} relevant document chunks:\n\n" + "\n---\n".join(formatted_results)
+            return _format_rag_results(results)
             
         except Exception as e:
             logger.error(f"Error in search_documents_tool: {e}")
@@ -250,16 +264,7 @@ def create_rag_tool_return(query: str, results: List[Dict[str, Any]]) -> ToolRet
             content="No relevant documents were found for your query."
         )
     
-    # Format results for the model
-    formatted_results = []
-    for i, result in enumerate(results, 1):
-        formatted_results.append(
-            f"Document {i}: {result['file_name']} (Chunk {result['chunk_index']})\n"
-            f"Relevance Score: {1 - result['distance']:.3f}\n"
-            f"Content:\n{result['content']}\n"
-        )
-    
-    content = f"Found {len(results)} relevant document chunks for query '{query}':\n\n" + "\n---\n".join(formatted_results)
+    content = _format_rag_results(results, query)
     
     return ToolReturn(
         return_value=f"Found {len(results)} relevant document chunks",
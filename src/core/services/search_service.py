@@ -5,33 +5,80 @@ Provides business logic and caching for search operations.
 """
 
 import asyncio
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta, timezone
-from collections import OrderedDict
+import hashlib
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
+
+from cachetools import TTLCache
+from pydantic import ValidationError
 
 from ..agent import RivalSearchAgent
 from ..models.schemas import SearchRequest, SearchResponse
 from ..utils.logging import get_logger
 from ..utils.validation import validate_query, sanitize_query
 
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
 logger = get_logger(__name__)
 
+# Namespace for search results stored in the shared Redis cache
+REDIS_KEY_PREFIX = b"rivalsearch:search:"
+
+INVALID_QUERY_ERROR = "Invalid query format"
+
+
+def _error_response(query: str, error: str) -> SearchResponse:
+    """Build a failed SearchResponse.
+    
+    Uses model_construct: every field is already correctly typed, so
+    re-running validation on the error path is wasted work.
+    """
+    return SearchResponse.model_construct(
+        success=False,
+        results=[],
+        total_results=0,
+        query=query,
+        error=error
+    )
+
 
 class SearchService:
     """Service for managing search operations with caching and optimization."""
     
-    def __init__(self, agent: RivalSearchAgent, cache_size: int = 100, cache_ttl: int = 3600):
+    def __init__(
+        self, 
+        agent: RivalSearchAgent, 
+        cache_size: int = 100, 
+        cache_ttl: int = 3600,
+        max_concurrency: int = 16,
+        redis: Optional["Redis"] = None,
+        max_entry_bytes: int = 64 * 1024,
+        negative_cache_ttl: int = 60
+    ):
         """Initialize the search service.
         
         Args:
             agent: RivalSearch Agent instance
             cache_size: Maximum number of cached results
             cache_ttl: Cache time-to-live in seconds
+            max_concurrency: Maximum number of searches run at once by batch_search
+            redis: Optional Redis client used as a shared second-level cache
+                across worker processes
+            max_entry_bytes: Responses whose serialized size exceeds this are
+                not cached, so one huge result set cannot evict many small ones
+            negative_cache_ttl: How long search_with_fallback remembers that a
+                request and its fallback both returned no results
         """
         self.agent = agent
         self.cache_size = cache_size
         self.cache_ttl = cache_ttl
-        self._cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.redis = redis
+        self.max_entry_bytes = max_entry_bytes
+        self._cache: TTLCache[bytes, SearchResponse] = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._inflight: Dict[bytes, asyncio.Task[SearchResponse]] = {}
+        self._no_results: TTLCache[bytes, bool] = TTLCache(maxsize=cache_size, ttl=negative_cache_ttl)
         
         logger.info(f"Search service initialized with cache size {cache_size} and TTL {cache_ttl}s")
     
@@ -48,41 +95,59 @@ class SearchService:
             # Validate and sanitize query
             sanitized_query = sanitize_query(request.query)
             if not validate_query(sanitized_query):
-                return SearchResponse(
-                    success=False,
-                    results=[],
-                    total_results=0,
-                    query=request.query,
-                    error="Invalid query format"
-                )
+                return _error_response(request.query, INVALID_QUERY_ERROR)
             
             # Check cache first
             cache_key = self._generate_cache_key(request)
-            cached_result = self._get_from_cache(cache_key)
+            cached_result = await self._get_from_cache(cache_key)
             
             if cached_result:
                 logger.info(f"Returning cached result for query: {sanitized_query}")
                 return cached_result
             
-            # Perform search
-            logger.info(f"Performing search for: {sanitized_query}")
-            response = await self.agent.search(request)
-            
-            # Cache successful results
-            if response.success:
-                self._add_to_cache(cache_key, response)
+            # Join an identical search that is already in flight. The search
+            # runs in its own task so cancelling one caller never cancels it
+            # for the others.
+            task = self._inflight.get(cache_key)
+            if task is None:
+                logger.info(f"Performing search for: {sanitized_query}")
+                task = asyncio.create_task(self._run_search(cache_key, request))
+                self._inflight[cache_key] = task
+                task.add_done_callback(lambda done: self._finish_inflight(cache_key, done))
+            else:
+                logger.info(f"Awaiting in-flight search for query: {sanitized_query}")
             
-            return response
+            return await asyncio.shield(task)
             
         except Exception as e:
             logger.error(f"Search service error: {e}")
-            return SearchResponse(
-                success=False,
-                results=[],
-                total_results=0,
-                query=request.query,
-                error=str(e)
-            )
+            return _error_response(request.query, str(e))
+    
+    async def _run_search(self, cache_key: bytes, request: SearchRequest) -> SearchResponse:
+        """Run one agent search and cache it if successful.
+        
+        Args:
+            cache_key: Cache key shared by every caller awaiting this search
+            request: Search request parameters
+            
+        Returns:
+            Search results
+        """
+        response = await self.agent.search(request)
+        
+        # Cache successful results
+        if response.success:
+            await self._add_to_cache(cache_key, response)
+        
+        return response
+    
+    def _finish_inflight(self, cache_key: bytes, task: "asyncio.Task[SearchResponse]") -> None:
+        """Forget a finished in-flight search."""
+        if self._inflight.get(cache_key) is task:
+            del self._inflight[cache_key]
+        # Awaiting callers re-raise any error; mark it retrieved in case none are left
+        if not task.cancelled():
+            task.exception()
     
     async def batch_search(self, requests: List[SearchRequest]) -> List[SearchResponse]:
         """Perform multiple searches concurrently.
@@ -96,8 +161,12 @@ class SearchService:
         try:
             logger.info(f"Performing batch search with {len(requests)} requests")
             
-            # Create tasks for concurrent execution
-            tasks = [self.search(request) for request in requests]
+            async def bounded_search(request: SearchRequest) -> SearchResponse:
+                async with self._semaphore:
+                    return await self.search(request)
+            
+            # Create tasks for concurrent execution, capped by the semaphore
+            tasks = [bounded_search(request) for request in requests]
             
             # Execute concurrently
             responses = await asyncio.gather(*tasks, return_exceptions=True)
@@ -105,15 +174,9 @@ class SearchService:
             # Handle exceptions
             processed_responses = []
             for i, response in enumerate(responses):
-                if isinstance(response, Exception):
-                    logger.error(f"Batch search error for request {i}: {response}")
-                    processed_responses.append(SearchResponse(
-                        success=False,
-                        results=[],
-                        total_results=0,
-                        query=requests[i].query,
-                        error=str(response)
-                    ))
+                if isinstance(response, BaseException):
+                    logger.error(f"Batch search error for request {i}: {response!r}")
+                    processed_responses.append(_error_response(requests[i].query, str(response)))
                 else:
                     processed_responses.append(response)
             
@@ -122,13 +185,7 @@ class SearchService:
         except Exception as e:
             logger.error(f"Batch search service error: {e}")
             return [
-                SearchResponse(
-                    success=False,
-                    results=[],
-                    total_results=0,
-                    query=req.query,
-                    error=str(e)
-                )
+                _error_response(req.query, str(e))
                 for req in requests
             ]
     
@@ -148,6 +205,16 @@ class SearchService:
             if response.success and response.results:
                 return response
             
+            # A rejected query fails the same way with any parameters
+            if response.error == INVALID_QUERY_ERROR:
+                return response
+            
+            # Both searches recently came back empty; don't repeat the fallback
+            cache_key = self._generate_cache_key(request)
+            if cache_key in self._no_results:
+                logger.debug(f"Skipping fallback for recently empty query: {request.query}")
+                return response
+            
             # Fallback: try with different parameters
             logger.info(f"Original search failed, trying fallback for: {request.query}")
             
@@ -165,86 +232,113 @@ class SearchService:
                 logger.info("Fallback search successful")
                 return fallback_response
             
+            # Only remember genuine empty results; errors may be transient
+            if response.success and fallback_response.success:
+                self._no_results[cache_key] = True
+            
             # Final fallback: return original response with error info
             return response
             
         except Exception as e:
             logger.error(f"Search with fallback error: {e}")
-            return SearchResponse(
-                success=False,
-                results=[],
-                total_results=0,
-                query=request.query,
-                error=f"Search failed with fallback: {str(e)}"
-            )
+            return _error_response(request.query, f"Search failed with fallback: {str(e)}")
     
-    def _generate_cache_key(self, request: SearchRequest) -> str:
+    def _generate_cache_key(self, request: SearchRequest) -> bytes:
         """Generate a cache key for the search request.
         
         Args:
             request: Search request
             
         Returns:
-            Cache key string
+            16-byte BLAKE2b digest of the canonical request parameters
         """
-        # Create a deterministic cache key
-        key_parts = [
-            request.query.lower().strip(),
-            str(request.num_results),
+        # Create a deterministic, fixed-size cache key
+        key_parts = (
+            request.query.casefold().strip(),
+            request.num_results,
             request.lang,
             request.safe,
-            request.region or "default"
-        ]
-        return "|".join(key_parts)
+            request.region or ""
+        )
+        return hashlib.blake2b(repr(key_parts).encode(), digest_size=16).digest()
     
-    def _get_from_cache(self, cache_key: str) -> Optional[SearchResponse]:
+    async def _get_from_cache(self, cache_key: bytes) -> Optional[SearchResponse]:
         """Get a result from cache.
         
+        Checks the in-process cache first, then Redis if configured. Redis hits
+        are promoted into the in-process cache.
+        
         Args:
             cache_key: Cache key
             
         Returns:
             Cached response if valid, None otherwise
         """
-        if cache_key not in self._cache:
+        # TTLCache drops expired entries on access and keeps LRU order itself
+        response = self._cache.get(cache_key)
+        if response is not None:
+            logger.debug(f"Cache hit for key: {cache_key.hex()}")
+            return response
+        
+        if self.redis is None:
             return None
         
-        cached_item = self._cache[cache_key]
+        try:
+            payload = await self.redis.get(REDIS_KEY_PREFIX + cache_key)
+        except Exception as e:
+            logger.warning(f"Redis cache lookup failed: {e}")
+            return None
         
-        # Check if cache entry is expired
-        if datetime.now(timezone.utc) > cached_item['expires_at']:
-            del self._cache[cache_key]
+        if payload is None:
             return None
         
-        # Move to end (LRU)
-        self._cache.move_to_end(cache_key)
+        try:
+            response = SearchResponse.model_validate_json(payload)
+        except ValidationError as e:
+            # Stale or incompatible entry, e.g. written under an older schema
+            logger.warning(f"Discarding unreadable Redis cache entry {cache_key.hex()}: {e}")
+            try:
+                await self.redis.delete(REDIS_KEY_PREFIX + cache_key)
+            except Exception as e:
+                logger.warning(f"Redis cache delete failed: {e}")
+            return None
         
-        logger.debug(f"Cache hit for key: {cache_key}")
-        return cached_item['response']
+        self._cache[cache_key] = response
+        logger.debug(f"Redis cache hit for key: {cache_key.hex()}")
+        return response
     
-    def _add_to_cache(self, cache_key: str, response: SearchResponse) -> None:
+    async def _add_to_cache(self, cache_key: bytes, response: SearchResponse) -> None:
         """Add a result to cache.
         
         Args:
             cache_key: Cache key
             response: Search response to cache
         """
-        # Remove oldest entry if cache is full
-        if len(self._cache) >= self.cache_size:
-            self._cache.popitem(last=False)
+        # Serialize once: the byte-size check and the Redis write share the payload
+        payload = response.model_dump_json().encode('utf-8')
+        if len(payload) > self.max_entry_bytes:
+            logger.debug(f"Skipping cache for key {cache_key.hex()}: {len(payload)} bytes exceeds limit")
+            return
         
-        # Add new entry
-        self._cache[cache_key] = {
-            'response': response,
-            'expires_at': datetime.now(timezone.utc) + timedelta(seconds=self.cache_ttl),
-            'created_at': datetime.now(timezone.utc)
-        }
+        # TTLCache evicts expired entries first, then the least recently used
+        self._cache[cache_key] = response
         
-        logger.debug(f"Cached result for key: {cache_key}")
+        if self.redis is not None:
+            try:
+                await self.redis.set(
+                    REDIS_KEY_PREFIX + cache_key,
+                    payload,
+                    ex=self.cache_ttl
+                )
+            except Exception as e:
+                logger.warning(f"Redis cache write failed: {e}")
+        
+        logger.debug(f"Cached result for key: {cache_key.hex()}")
     
     def clear_cache(self) -> None:
         """Clear the search cache."""
         self._cache.clear()
+        self._no_results.clear()
         logger.info("Search cache cleared")
     
     def get_cache_stats(self) -> Dict[str, Any]:
@@ -253,16 +347,15 @@ class SearchService:
         Returns:
             Cache statistics dictionary
         """
-        now = datetime.now(timezone.utc)
-        valid_entries = sum(
-            1 for item in self._cache.values()
-            if now <= item['expires_at']
-        )
+        total_entries = len(self._cache)
+        # Membership checks honour the TTL, unlike len()
+        valid_entries = sum(1 for key in list(self._cache.keys()) if key in self._cache)
         
         return {
-            'total_entries': len(self._cache),
+            'total_entries': total_entries,
             'valid_entries': valid_entries,
-            'expired_entries': len(self._cache) - valid_entries,
+            'expired_entries': total_entries - valid_entries,
             'cache_size': self.cache_size,
-            'cache_ttl': self.cache_ttl
+            'cache_ttl': self.cache_ttl,
+            'max_entry_bytes': self.max_entry_bytes
         }
@@ -8,6 +8,10 @@ import re
 from typing import Optional
 from urllib.parse import urlparse
 
+# Compiled once; validation runs on every search request
+_WS_RE = re.compile(r'\s+')
+_DANGER_RE = re.compile(r'[<>"\']')
+
 
 def validate_url(url: str) -> bool:
     """Validate if a string is a valid URL.
@@ -43,7 +47,7 @@ def validate_query(query: str) -> bool:
         return False
     
     # Check for basic content (not just whitespace or special characters)
-    if not re.search(r'[a-zA-Z0-9]', cleaned_query):
+    if not any(c.isalnum() for c in cleaned_query):
         return False
     
     return True
@@ -62,9 +66,9 @@ def sanitize_query(query: Optional[str]) -> str:
         return ""
     
     # Remove extra whitespace
-    sanitized = re.sub(r'\s+', ' ', query.strip())
+    sanitized = _WS_RE.sub(' ', query.strip())
     
     # Remove potentially dangerous characters
-    sanitized = re.sub(r'[<>"\']', '', sanitized)
+    sanitized = _DANGER_RE.sub('', sanitized)
     
     return sanitized